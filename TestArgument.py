@@ -1,6 +1,20 @@
+import io
+import json
+import pickle
+import random
+
 from arguments.Argument import Argument
-from pw_argumentation import ArgumentAgent, ArgumentModel
+from arguments.ArgumentPayload import ArgumentPayload
+from arguments.ComparisonPremisses import ComparisonPremisses
+from pw_argumentation import ArgumentAgent, ArgumentModel, run_in_processes
+from communication.logger.DialogueLogger import DialogueLogger
+from communication.mailbox.ArchivedHistory import ArchivedHistory
+from communication.profiler.Profiler import Profiler
+from communication.preferences.CriterionName import Criterion
 from communication.preferences.EnginesCorpus import EnginesCorpus
+from communication.preferences.Item import Item
+from communication.preferences.Preferences import Preferences
+from communication.preferences.Value import Value
 
 
 if __name__ == '__main__':
@@ -12,4 +26,130 @@ if __name__ == '__main__':
     arg = Argument(True, engines_list[0]._Item__name)
     arg.List_supporting_proposal(arg.item_name, agent.preferences)
     print([str(premiss) for premiss in arg.comparison_list])
-    print([str(premiss) for premiss in arg.couple_values_list])
\ No newline at end of file
+    print([str(premiss) for premiss in arg.couple_values_list])
+    if arg.couple_values_list:
+        arg_text = '{}, {}'.format(arg.item_name, arg.couple_values_list[0])
+        payload = agent.argument_parsing(arg_text)
+        assert str(payload) == arg_text and agent.argument_parsing(payload) is payload
+        print(arg_text, '->', agent.generate_counter_argument(payload))
+
+    records = io.StringIO()
+    negotiation = ArgumentModel(
+        corpus_size=50, seed=1, agent_count=20, coalition_rule='majority',
+        logger=DialogueLogger(records, buffer_size=64, record_format=DialogueLogger.JSON),
+    )
+    reason, step_count = negotiation.run_until_done()
+    records = [json.loads(line) for line in records.getvalue().splitlines()]
+    assert len([record for record in records if 'performative' in record]) == negotiation.message_service.get_sent_count()
+    item_name, coalition = negotiation.get_coalition()
+    assert reason != ArgumentModel.AGREEMENT or negotiation.coalition_rule.is_coalition(len(coalition))
+    print('20 agents, {}: {} after {} steps, {} agents committed to {}'.format(
+        negotiation.coalition_rule, reason, step_count, len(coalition), item_name))
+
+    transcripts = []
+    for profiler in (None, Profiler()):
+        transcript = io.StringIO()
+        ArgumentModel(corpus_size=50, seed=3, logger=DialogueLogger(transcript), profiler=profiler).run_until_done()
+        transcripts.append(transcript.getvalue())
+    assert transcripts[0] == transcripts[1] and profiler.get_timings()['ArgumentAgent.step'][0] > 0
+    print(profiler.format_report())
+
+    # N agents: run_until_done stops on the same agreement as stepping on up to the step limit
+    silent = DialogueLogger(level=DialogueLogger.OFF)
+    for agent_count, coalition_rule, quorum, seed in ((10, 'quorum', 4, 19), (50, 'majority', None, 15)):
+        settings = dict(corpus_size=50, agent_count=agent_count, coalition_rule=coalition_rule, quorum=quorum,
+                        logger=silent)
+        reason, step_count = ArgumentModel(seed=seed, **settings).run_until_done()
+        stepped = ArgumentModel(seed=seed, **settings)
+        agreement_step = next((step for step in range(1, 101) if stepped.step() or stepped.is_agreement()), None)
+        assert (reason == ArgumentModel.AGREEMENT) == (agreement_step is not None)
+        assert reason != ArgumentModel.AGREEMENT or step_count == agreement_step
+        print('{} agents, {}: {} after {} steps'.format(agent_count, stepped.coalition_rule, reason, step_count))
+
+    # agents partitioned across processes: the transcripts of the workers are written by the parent process
+    transcript = io.StringIO()
+    agreed_items = run_in_processes(corpus_size=20, seed=1, worker_count=3, agent_count=6,
+                                    log_level=DialogueLogger.INFO, log_stream=transcript)
+    assert len(agreed_items) == 6 and transcript.getvalue().count('PROPOSE') >= 1
+    print('6 agents on 3 processes:', agreed_items)
+    # the messages are delivered in the activation order of their senders, whatever the worker they live in:
+    # the outcome does not depend on the number of workers, nor on the batch drawing of the preferences
+    for seed, agent_count in ((2, 4), (3, 6), (4, 120)):
+        outcomes = [run_in_processes(corpus_size=20, step_count=8, worker_count=worker_count, seed=seed,
+                                     agent_count=agent_count, coalition_rule='majority')
+                    for worker_count in (1, 2, 4)]
+        assert outcomes[0] == outcomes[1] == outcomes[2] and any(outcomes[0].values())
+    print('Same outcome on 1, 2 and 4 processes')
+
+    # bounded history: the arguments spilled to disk are still read back, in order
+    histories = []
+    for history_size in (None, 2):
+        bounded = ArgumentModel(corpus_size=50, seed=0, history_size=history_size, logger=silent)
+        bounded.run_until_done()
+        histories.append([[str(entry['content']) for entry in agent.argumentation] for agent in bounded.argument_agents])
+    assert histories[0] == histories[1] and len(histories[1][0]) > 2
+
+    # from BATCH_PREFERENCES_MIN_AGENTS agents the preferences are drawn at once, still reproduced from the seed
+    outcomes = [ArgumentModel(corpus_size=50, seed=5, agent_count=200, coalition_rule='majority', logger=silent)
+                .run_until_done() for _ in range(2)]
+    assert outcomes[0] == outcomes[1]
+    print('200 agents, batch preferences:', outcomes[0])
+
+    # criteria generated at runtime (Criterion.create), through Preferences, Argument and ComparisonPremisses
+    class GeneratedItem(Item):
+        """Item with one attribute per generated criterion."""
+
+    criteria = Criterion.create('GeneratedCriterion', ['CRITERION_{}'.format(column) for column in range(40)])
+    assert len(criteria) == 40 and criteria.CRITERION_7.value == 7 and criteria(7) is criteria['CRITERION_7']
+    assert criteria.CRITERION_7.fullname == 'CRITERION_7'
+    threshold_ranges = {criterion.name: [(70, 80, 1), (50, 60, 1), (30, 40, 1)] for criterion in criteria}
+    item_rng = random.Random(2)
+    generated_items = []
+    for index in range(30):
+        generated_item = GeneratedItem('Generated Item {}'.format(index), 'item with 40 criteria')
+        for criterion in criteria:
+            setattr(generated_item, criterion.name, item_rng.randrange(100))
+        generated_items.append(generated_item)
+
+    generated_prefs = Preferences(generated_items, criteria=criteria, threshold_ranges=threshold_ranges,
+                                  rng=random.Random(0))
+    batch_prefs = Preferences.generate_batch(generated_items, 2, rng=0, criteria=criteria,
+                                             threshold_ranges=threshold_ranges)
+    for prefs in [generated_prefs] + batch_prefs:
+        for criterion in criteria:
+            low, middle, high = prefs.get_criterion_category()[criterion.name]
+            attribute = getattr(generated_items[0], criterion.name)
+            expected = Value.VERY_BAD if attribute > low else Value.BAD if attribute > middle else \
+                Value.GOOD if attribute > high else Value.VERY_GOOD
+            assert prefs.get_value(generated_items[0], criterion) == expected
+
+    order = generated_prefs.get_criterion_name_list()
+    assert sorted(order, key=lambda criterion: criterion.value) == list(criteria)
+    assert all(generated_prefs.get_criterion_rank(criterion) == rank for rank, criterion in enumerate(order))
+    assert generated_prefs.is_preferred_criterion(order[0], order[-1])
+    assert not generated_prefs.is_preferred_criterion(order[-1], order[0])
+
+    best_item = generated_prefs.most_preferred()
+    generated_argument = Argument(True, best_item.get_name())
+    generated_argument.List_supporting_proposal(best_item.get_name(), generated_prefs)
+    _, best_couple_value = generated_argument.select_best_premiss()
+    assert best_couple_value.criterion_name in criteria and best_couple_value.value.value >= Value.GOOD.value
+    premisses = ComparisonPremisses(order)
+    assert len(premisses) == 40 * 39 // 2
+    comparison = premisses.get(order[3], order[39])
+    assert comparison.best_criterion_name is order[3] and comparison.worst_criterion_name is order[39]
+    assert premisses.get(order[39], order[3]) is None
+    print('40 generated criteria: {} supported by {}'.format(best_item.get_name(), best_couple_value))
+
+    # runtime criteria are pickled by reference to their set: they go through pickle and archives
+    assert pickle.loads(pickle.dumps(order[5])) is order[5]
+    spilled = ArchivedHistory(1)
+    for entry in ({'sender': 'agent1', 'content': ArgumentPayload(True, best_item.get_name(), best_couple_value,
+                                                                  comparison)},
+                  {'sender': 'agent2', 'content': None}):
+        spilled.append(entry)
+    archived_payload = next(iter(spilled))['content']
+    assert archived_payload.couple_value.criterion_name is best_couple_value.criterion_name
+    assert archived_payload.comparison.best_criterion_name is order[3]
+    spilled.close()
+    print('runtime criteria pickled and archived => OK')
@@ -1,6 +1,7 @@
 from communication.preferences.EnginesCorpus import EnginesCorpus
 from communication.preferences.Preferences import Preferences
 from communication.preferences.CriterionName import CriterionName
+from communication.preferences.Value import Value
 
 
 if __name__ == '__main__':
@@ -26,7 +27,59 @@ if __name__ == '__main__':
     print('Diesel Engine (for agent 1) = {}'.format(diesel_engine.get_score(agent_pref)))
     print('Most preferred item is : {}'.format(agent_pref.most_preferred(engines_list, evaluation_needed=True).get_name()))
     print('Is eletric engine among 10 % preferred items: {}'.format(agent_pref.is_item_among_top_10_percent(electric_engine, item_list=engines_list, evaluation_needed=False)))
-    print([item._Item__name for item in agent_pref._Preferences__item_ordered_list])
+    print([item._Item__name for item in agent_pref.get_item_ordered_list()])
+    print('Rank of electric engine : {}, preferred items : {}'.format(agent_pref.rank_of(electric_engine), [item.get_name() for item in agent_pref.items_above(electric_engine)]))
     pref_dict = agent_pref.print_preferences_dict(engines_list)
     for k,v in pref_dict.items():
         print(k, ':', v)
+    
+    """test incremental changes of the item list"""
+    best_engine = agent_pref.most_preferred(evaluation_needed=False)
+    agent_pref.remove_item(best_engine)
+    print('Without {}, most preferred item is : {}'.format(best_engine.get_name(), agent_pref.most_preferred(evaluation_needed=False).get_name()))
+    agent_pref.add_item(best_engine)
+    print('{} added back, ordered list : {}'.format(best_engine.get_name(), [item.get_name() for item in agent_pref.get_item_ordered_list()]))
+    
+    """test the preferences generated for many agents at once"""
+    def classify(value, thresholds):
+        if value > thresholds[0]:
+            return Value.VERY_BAD
+        elif value > thresholds[1]:
+            return Value.BAD
+        elif value > thresholds[2]:
+            return Value.GOOD
+        return Value.VERY_GOOD
+    
+    batch = Preferences.generate_batch(engines_list, 5, rng=0)
+    for batch_pref in batch:
+        criterion_category = batch_pref.get_criterion_category()
+        for engine in engines_list:
+            for criterion in CriterionName:
+                assert batch_pref.get_value(engine, criterion) == classify(
+                    getattr(engine, criterion.name), criterion_category[criterion.name])
+    other_orders = [[item.get_name() for item in batch_pref.get_item_ordered_list()] for batch_pref in batch[1:]]
+    removed_engine = batch[0].most_preferred()
+    batch[0].remove_item(removed_engine)
+    assert removed_engine not in batch[0].get_item_ordered_list()
+    assert [[item.get_name() for item in batch_pref.get_item_ordered_list()] for batch_pref in batch[1:]] == other_orders
+    assert all(batch_pref.get_value(removed_engine, CriterionName.NOISE) is not None for batch_pref in batch[1:])
+    print('Batch of {} preferences : values and item lists checked'.format(len(batch)))
+    
+    """test the item removals over a columnar corpus, the corpus being shared instead of copied"""
+    import random
+    columnar_engines = EnginesCorpus(200, columnar=True)
+    columnar_pref = Preferences(columnar_engines.columns, rng=random.Random(3))
+    object_engines = EnginesCorpus(200).generate_engines_list()
+    object_pref = Preferences(object_engines, rng=random.Random(3))
+    def names(preferences):
+        return [item.get_name() for item in preferences.get_item_ordered_list()]
+    for _ in range(5):
+        removed_name = columnar_pref.most_preferred().get_name()
+        columnar_pref.remove_item(columnar_pref.get_item_from_name(removed_name))
+        object_pref.remove_item(object_pref.get_item_from_name(removed_name))
+        assert columnar_pref.get_item_from_name(removed_name) is None
+    assert names(columnar_pref) == names(object_pref)
+    assert columnar_pref.most_preferred(columnar_engines.columns).get_name() == object_pref.most_preferred(object_engines).get_name()
+    assert names(columnar_pref) == names(object_pref)
+    assert len(columnar_pref.get_item_ordered_list()) == len(columnar_engines.columns)
+    print('Columnar corpus : removals and restore checked')
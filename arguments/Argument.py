@@ -1,6 +1,7 @@
 #!/ usr/bin /env python3
 
 from arguments.Comparison import Comparison
+from arguments.ComparisonPremisses import ComparisonPremisses
 from arguments.CoupleValue import CoupleValue
 
 
@@ -15,6 +16,11 @@ class Argument:
         couple_values_list:
     """
 
+    __slots__ = ('boolean_decision', 'item_name', 'comparison_list', 'couple_values_list', 'ordered_criterion')
+
+    # argumentation policies implemented by select_best_premiss
+    ARGUMENTATION_POLICIES = ('best_criterion',)
+
     def __init__(self, boolean_decision, item_name):
         """ Creates a new Argument.
         :param boolean_decision: True if the argument is positive for the given item, False if not.
@@ -30,6 +36,8 @@ class Argument:
         
         Criterion 1 has to be better ranked in the preferences system of the agent than Criterion 2.
         """
+        if not isinstance(self.comparison_list, list):
+            self.comparison_list = list(self.comparison_list)
         self.comparison_list.append(Comparison(criterion_name_1, criterion_name_2))
 
     def add_premiss_couple_values(self, criterion_name, value):
@@ -48,55 +56,50 @@ class Argument:
         self.comparison_list = []
         self.couple_values_list = []
     
+    def __generate_premisses(self, item_name, preferences, supporting):
+        """ Return the criterion order and the (comparisons, couple values) premisses for or against an item.
+        
+        The premisses only depend on the preferences and the item, so they are memoized in the preferences
+        and generated again only after the preferences changed. Comparisons are a ComparisonPremisses,
+        which creates the Comparison objects on demand.
+        """
+        def generate():
+            # get the full item object corresponding to the name
+            working_item = preferences.get_item_from_name(item_name)
+            assert working_item, 'Given item {} not found in preferences item list.'.format(item_name)
+            
+            # get list of criterion ordered by preference for the agent
+            ordered_criterion = tuple(preferences.get_criterion_name_list())
+            # Add criterion/value premisses:
+            # good and very good values to support the item, bad and very bad ones to attack it
+            couple_values = []
+            for criterion in ordered_criterion:
+                value = preferences.get_value(working_item, criterion)
+                if (value.value >= 2) == supporting:
+                    couple_values.append(CoupleValue(criterion, value))
+            # Add criterion/criterion premisses:
+            return ordered_criterion, ComparisonPremisses(ordered_criterion), tuple(couple_values)
+        
+        key = ('supporting' if supporting else 'attacking', item_name)
+        return preferences.get_memoized(key, generate)
+    
+    def __store_premisses(self, item_name, preferences, supporting):
+        """ Store the premisses in the argument if it is about item_name, otherwise return them."""
+        ordered_criterion, comparisons, couple_values = self.__generate_premisses(item_name, preferences, supporting)
+        self.ordered_criterion = list(ordered_criterion)
+        if item_name == self.item_name:
+            self.comparison_list = comparisons
+            self.couple_values_list = list(couple_values)
+            return [], []
+        return comparisons, list(couple_values)
+    
     def List_supporting_proposal(self, item_name, preferences):
         """ Generate a list of premisses which can be used to support an item
             : param item : Item - name of the item
             : return : list of all premisses PRO an item ( sorted by order of importance
             based on agent ’s preferences )
         """
-        
-        # Clear premisses storage lists
-        if item_name == self.item_name:
-            self.clear_existing_premisses()
-        
-        premisses_couple_values = []
-        premisses_comparison = []
-        
-        # get the full item object corresponding to the name
-        working_item = None
-        for item in preferences._Preferences__item_list:
-            if item._Item__name == item_name:
-                working_item = item
-                break
-        assert working_item, 'Given item {} not found in preferences item list.'.format(item_name)
-        
-        # Add criterion/value premisses
-        # Search for all the criterion values in the preferences for given item having a good or very good review
-        # get list of criterion ordered by preference for the agent
-        ordered_criterion = preferences._Preferences__criterion_name_list
-        # Retrieving item evaluation
-        item_evaluation = {}
-        for criterion in ordered_criterion:
-            item_evaluation[criterion] = preferences.get_value(working_item, criterion)
-        # Searching for good and very good values in evaluation
-        for criterion, value in item_evaluation.items():
-            if value.value >= 2:
-                if item_name == self.item_name:
-                    self.add_premiss_couple_values(criterion, value)
-                else: 
-                    premisses_couple_values.append(CoupleValue(criterion, value))
-        
-        # Add criterion/criterion premisses:
-        for best_index in range(len(ordered_criterion)-1):
-            for worst_index in range(best_index+1, len(ordered_criterion)):
-                if item_name == self.item_name:
-                    self.add_premiss_comparison(ordered_criterion[best_index], ordered_criterion[worst_index])
-                else:
-                    premisses_comparison.append(Comparison(ordered_criterion[best_index], ordered_criterion[worst_index]))
-        
-        self.ordered_criterion = ordered_criterion
-        
-        return premisses_comparison, premisses_couple_values
+        return self.__store_premisses(item_name, preferences, True)
     
     
     def List_attacking_proposal(self, item_name, preferences):
@@ -105,49 +108,18 @@ class Argument:
             : return : list of all premisses CON an item ( sorted by order of importance
             based on preferences )
         """
-        # Clear premisses storage lists
-        if item_name == self.item_name:
-            self.clear_existing_premisses()
-        
-        premisses_couple_values = []
-        premisses_comparison = []        
-        
-        # get the full item object corresponding to the name
-        working_item = None
-        for item in preferences._Preferences__item_list:
-            if item._Item__name == item_name:
-                working_item = item
-                break
-        assert working_item, 'Given item {} not found in preferences item list.'.format(item_name)
-        
-        # Add criterion/value premisses
-        # Search for all the criterion values in the preferences for given item having a good or very good review
-        # get list of criterion ordered by preference for the agent
-        ordered_criterion = preferences._Preferences__criterion_name_list
-        # Retrieving item evaluation
-        item_evaluation = {}
-        for criterion in ordered_criterion:
-            item_evaluation[criterion] = preferences.get_value(working_item, criterion)
-        # Searching for good and very good values in evaluation
-        for criterion, value in item_evaluation.items():
-            if value < 2:
-                if item_name == self.item_name:
-                    self.add_premiss_couple_values(criterion, value)
-                else: 
-                    premisses_couple_values.append(CoupleValue(criterion, value))
-        
-        # Add criterion/criterion premisses:
-        for best_index in range(len(ordered_criterion)-1):
-            for worst_index in range(best_index+1, len(ordered_criterion)):
-                if item_name == self.item_name:
-                    self.add_premiss_comparison(ordered_criterion[best_index], ordered_criterion[worst_index])
-                else:
-                    premisses_comparison.append(Comparison(ordered_criterion[best_index], ordered_criterion[worst_index]))
-        
-        self.ordered_criterion = ordered_criterion
-        
-        return (premisses_comparison, premisses_couple_values)
+        return self.__store_premisses(item_name, preferences, False)
+    
     
+    def find_premiss_comparison(self, best_criterion_name, worst_criterion_name):
+        """ Return the premiss comparison best > worst of the comparison list, None if there is none.
+        """
+        if isinstance(self.comparison_list, ComparisonPremisses):
+            return self.comparison_list.get(best_criterion_name, worst_criterion_name)
+        for comparison in self.comparison_list:
+            if comparison.best_criterion_name == best_criterion_name and comparison.worst_criterion_name == worst_criterion_name:
+                return comparison
+        return None
     
     def select_best_premiss(self, argumentation_policy='best_criterion', last_opponent_crit=None):
         """Select the best premiss to build an argument according to the chosen policy.
@@ -188,9 +160,6 @@ class Argument:
                             chosen_couple_value = couple_value
                             break
                 # find the premiss for criterion order
-                for comparison in self.comparison_list:
-                    if comparison.best_criterion_name == chosen_couple_value.criterion_name and comparison.worst_criterion_name == last_opponent_crit:
-                        chosen_comparison = comparison
-                        break
+                chosen_comparison = self.find_premiss_comparison(chosen_couple_value.criterion_name, last_opponent_crit)
             
             return (chosen_comparison, chosen_couple_value)
\ No newline at end of file
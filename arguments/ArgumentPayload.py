@@ -0,0 +1,41 @@
+#!/ usr/bin /env python3
+
+
+class ArgumentPayload:
+    """ ArgumentPayload class.
+    This class implements the content of an ARGUE message: the conclusion and the premisses of the argument,
+    passed by reference from the sender to the receiver (they must not be modified).
+
+    str gives the textual form of the argument, for logging:
+    CONCLUSION, PREMISS1 [and PREMISS2], the conclusion being ITEM or NOT ITEM.
+
+    attr:
+        boolean_decision: True if the argument supports the item, False if it attacks it
+        item_name: the name of the item concluded on
+        couple_value: the criterion value premiss (CoupleValue)
+        comparison: the optional criterion comparison premiss (Comparison or None)
+    """
+
+    __slots__ = ('boolean_decision', 'item_name', 'couple_value', 'comparison')
+
+    def __init__(self, boolean_decision, item_name, couple_value, comparison=None):
+        """ Creates a new argument payload.
+        """
+        self.boolean_decision = boolean_decision
+        self.item_name = item_name
+        self.couple_value = couple_value
+        self.comparison = comparison
+
+    def get_key(self):
+        """ Return a tuple identifying the argument: equal for arguments with the same conclusion and premisses.
+        """
+        key = (self.boolean_decision, self.item_name, self.couple_value.criterion_name, self.couple_value.value)
+        if self.comparison is None:
+            return key
+        return key + (self.comparison.best_criterion_name, self.comparison.worst_criterion_name)
+
+    def __str__(self):
+        conclusion = self.item_name if self.boolean_decision else 'NOT ' + self.item_name
+        if self.comparison is None:
+            return '{}, {}'.format(conclusion, self.couple_value)
+        return '{}, {} and {}'.format(conclusion, self.couple_value, self.comparison)
@@ -0,0 +1,46 @@
+#!/ usr/bin /env python3
+
+
+class CoalitionRule:
+    """ CoalitionRule class.
+    This class implements the rule deciding when agents agreeing on an item are enough to commit to it,
+    among the agent_count agents of a negotiation.
+
+    Possible rules:
+        all: every agent has to agree
+        majority: more than half of the agents have to agree
+        quorum: at least quorum agents have to agree
+
+    attr:
+        rule: the name of the rule
+        agent_count: the number of agents negotiating
+        size: the minimum number of agents of a coalition
+    """
+
+    __slots__ = ('rule', 'agent_count', 'size')
+
+    RULES = ('all', 'majority', 'quorum')
+
+    def __init__(self, rule='all', agent_count=2, quorum=None):
+        """ Creates a new coalition rule.
+        """
+        if rule not in CoalitionRule.RULES:
+            raise ValueError("unknown coalition rule {}".format(rule))
+        if rule == 'quorum' and (quorum is None or not 1 <= quorum <= agent_count):
+            raise ValueError("the quorum rule needs a quorum between 1 and {}".format(agent_count))
+        self.rule = rule
+        self.agent_count = agent_count
+        if rule == 'all':
+            self.size = agent_count
+        elif rule == 'majority':
+            self.size = agent_count // 2 + 1
+        else:
+            self.size = quorum
+
+    def is_coalition(self, agreeing_count):
+        """ Return True if agreeing_count agents agreeing on an item are enough to commit to it.
+        """
+        return agreeing_count >= self.size
+
+    def __str__(self):
+        return '{} ({} of {} agents)'.format(self.rule, self.size, self.agent_count)
@@ -8,6 +8,9 @@ class Comparison :
         best_criterion_name :
         worst_criterion_name :
     """
+
+    __slots__ = ('best_criterion_name', 'worst_criterion_name')
+
     def __init__ (self, best_criterion_name, worst_criterion_name):
         """ Creates a new comparison .
         """
@@ -0,0 +1,41 @@
+#!/ usr/bin /env python3
+
+from arguments.Comparison import Comparison
+
+
+class ComparisonPremisses :
+    """ ComparisonPremisses class .
+    This class implements the comparison premisses of an argument, one per couple of criteria
+    ( best criterion ranked before worst criterion in the agent order ). Comparison objects are
+    created on demand instead of materializing all of them .
+
+    attr :
+        ordered_criterion : the criteria ordered by importance
+    """
+
+    __slots__ = ('ordered_criterion', '__ranks')
+
+    def __init__ (self, ordered_criterion):
+        """ Creates the comparison premisses of a criterion order .
+        """
+        self.ordered_criterion = tuple(ordered_criterion)
+        self.__ranks = {criterion: rank for rank, criterion in enumerate(self.ordered_criterion)}
+
+    def __len__(self):
+        return len(self.ordered_criterion) * (len(self.ordered_criterion) - 1) // 2
+
+    def __iter__(self):
+        """ Yield the comparisons ordered by best criterion, then by worst criterion .
+        """
+        for best_index in range(len(self.ordered_criterion)-1):
+            for worst_index in range(best_index+1, len(self.ordered_criterion)):
+                yield Comparison(self.ordered_criterion[best_index], self.ordered_criterion[worst_index])
+
+    def get(self, best_criterion_name, worst_criterion_name):
+        """ Return the comparison best > worst if it is a premiss, None otherwise .
+        """
+        best_rank = self.__ranks.get(best_criterion_name)
+        worst_rank = self.__ranks.get(worst_criterion_name)
+        if best_rank is None or worst_rank is None or best_rank >= worst_rank:
+            return None
+        return Comparison(best_criterion_name, worst_criterion_name)
@@ -10,6 +10,8 @@ class CoupleValue :
         value :
     """
 
+    __slots__ = ('criterion_name', 'value')
+
     def __init__ (self, criterion_name, value):
         """ Creates a new couple value.
         """
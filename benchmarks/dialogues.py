@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Dialogue throughput benchmark.
+
+Runs complete dialogues between the two agents of an ArgumentModel in a single process, either one model after
+the other, with all the models alive and stepped in turn (each model has its own message service), or with all
+the agents running as coroutines on one event loop, and reports the number of dialogues per second.
+
+Run from the repository root: python -m benchmarks.dialogues [dialogue_count] [corpus_size]
+"""
+import asyncio
+import sys
+import time
+
+from communication.logger.DialogueLogger import DialogueLogger
+from pw_argumentation import ArgumentModel
+
+STEP_COUNT = 10
+
+# the transcripts of the dialogues are not logged
+SILENT = DialogueLogger(level=DialogueLogger.OFF)
+
+
+def run_sequential(dialogue_count, corpus_size):
+    """Runs dialogue_count dialogues one after the other, returns the number of dialogues per second."""
+    start = time.perf_counter()
+    for _ in range(dialogue_count):
+        model = ArgumentModel(corpus_size=corpus_size, logger=SILENT)
+        for _ in range(STEP_COUNT):
+            model.step()
+    return dialogue_count / (time.perf_counter() - start)
+
+
+def run_interleaved(dialogue_count, corpus_size):
+    """Runs dialogue_count dialogues side by side, each step being made on every model before the next one,
+    returns the number of dialogues per second."""
+    start = time.perf_counter()
+    models = [ArgumentModel(corpus_size=corpus_size, logger=SILENT) for _ in range(dialogue_count)]
+    for _ in range(STEP_COUNT):
+        for model in models:
+            model.step()
+    return dialogue_count / (time.perf_counter() - start)
+
+
+def run_asyncio(dialogue_count, corpus_size):
+    """Runs dialogue_count dialogues concurrently on one event loop, returns the number of dialogues per second."""
+    async def run_models(models):
+        await asyncio.gather(*(model.run_async(STEP_COUNT) for model in models))
+
+    start = time.perf_counter()
+    asyncio.run(run_models([ArgumentModel(corpus_size=corpus_size, asynchronous=True, logger=SILENT) for _ in range(dialogue_count)]))
+    return dialogue_count / (time.perf_counter() - start)
+
+
+def run(dialogue_count=200, corpus_size=10):
+    """Returns {mode: dialogues per second}, the transcripts of the dialogues being discarded."""
+    return {
+        'sequential': run_sequential(dialogue_count, corpus_size),
+        'interleaved': run_interleaved(dialogue_count, corpus_size),
+        'asyncio': run_asyncio(dialogue_count, corpus_size),
+    }
+
+
+if __name__ == "__main__":
+    dialogue_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    corpus_size = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    print("{} dialogues of {} steps, corpus of {} engines".format(dialogue_count, STEP_COUNT, corpus_size))
+    for mode, throughput in run(dialogue_count, corpus_size).items():
+        print("{:>12} : {:10.1f} dialogues/s".format(mode, throughput))
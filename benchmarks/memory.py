@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark of the core value objects.
+
+Reports the bytes allocated per object for the current (__slots__ based) classes and for dict-backed
+replicas of the same classes, which is how they were laid out before.
+
+Run from the repository root: python -m benchmarks.memory [count]
+"""
+import sys
+import tracemalloc
+
+from arguments.Argument import Argument
+from arguments.Comparison import Comparison
+from arguments.CoupleValue import CoupleValue
+from communication.message.Message import Message
+from communication.message.MessagePerformative import MessagePerformative
+from communication.preferences.CriterionName import CriterionName
+from communication.preferences.CriterionValue import CriterionValue
+from communication.preferences.ElectricEngine import ElectricEngine
+from communication.preferences.Item import Item
+from communication.preferences.Value import Value
+
+
+def dict_backed(cls):
+    """Returns a replica of a class without __slots__: same methods, attributes stored in an instance __dict__."""
+    slot_names = {'__slots__'} | {
+        '_' + cls.__name__ + slot if slot.startswith('__') else slot for slot in cls.__slots__
+    }
+    return type(cls.__name__, (object,), {key: value for key, value in vars(cls).items() if key not in slot_names})
+
+
+DictItem = dict_backed(Item)
+
+
+def dict_backed_engine(name, quality_factor):
+    """Replica of an ElectricEngine stored in an instance __dict__."""
+    engine = DictItem(name, ElectricEngine.DESCRIPTION.format(quality_factor))
+    for criterion, value in ElectricEngine.criterion_values(quality_factor).items():
+        setattr(engine, criterion, value)
+    return engine
+
+
+def bytes_per_object(factory, count):
+    """Returns the number of bytes allocated per object created by factory(index)."""
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    objects = [factory(index) for index in range(count)]
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # the list holding the objects is not part of their size
+    return (end - start) / count - sys.getsizeof(objects) / count
+
+
+def run(count=100000):
+    """Returns {object name: (dict-backed bytes, slotted bytes)} measured on count objects."""
+    DictMessage = dict_backed(Message)
+    DictCriterionValue = dict_backed(CriterionValue)
+    DictCoupleValue = dict_backed(CoupleValue)
+    DictComparison = dict_backed(Comparison)
+    DictArgument = dict_backed(Argument)
+    names = ['Electric Engine {}'.format(index) for index in range(count)]
+    item = ElectricEngine(names[0], 0.5)
+    performative = MessagePerformative.PROPOSE
+    criterion_1, criterion_2 = CriterionName.NOISE, CriterionName.DURABILITY
+    return {
+        'item': (
+            bytes_per_object(lambda index: dict_backed_engine(names[index], 0.5), count),
+            bytes_per_object(lambda index: ElectricEngine(names[index], 0.5), count),
+        ),
+        'message': (
+            bytes_per_object(lambda index: DictMessage('agent1', 'agent2', performative, names[index]), count),
+            bytes_per_object(lambda index: Message('agent1', 'agent2', performative, names[index]), count),
+        ),
+        'criterion value': (
+            bytes_per_object(lambda index: DictCriterionValue(item, criterion_1.name, Value.GOOD), count),
+            bytes_per_object(lambda index: CriterionValue(item, criterion_1.name, Value.GOOD), count),
+        ),
+        'couple value': (
+            bytes_per_object(lambda index: DictCoupleValue(criterion_1, Value.GOOD), count),
+            bytes_per_object(lambda index: CoupleValue(criterion_1, Value.GOOD), count),
+        ),
+        'comparison': (
+            bytes_per_object(lambda index: DictComparison(criterion_1, criterion_2), count),
+            bytes_per_object(lambda index: Comparison(criterion_1, criterion_2), count),
+        ),
+        'argument': (
+            bytes_per_object(lambda index: DictArgument(True, names[index]), count),
+            bytes_per_object(lambda index: Argument(True, names[index]), count),
+        ),
+    }
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print('bytes per object ({} objects)'.format(count))
+    print('{:<16}{:>14}{:>10}'.format('object', 'dict-backed', 'slots'))
+    for name, (before, after) in run(count).items():
+        print('{:<16}{:>14.1f}{:>10.1f}'.format(name, before, after))
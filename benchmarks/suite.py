@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite.
+
+Times the building blocks of the dialogues over a grid of corpus sizes (10 to 10^6 engines) and agent counts
+(2 to 1000 agents):
+    corpus: EnginesCorpus construction (engine objects up to 10^5 engines, columnar at every size)
+    preferences: Preferences construction over a corpus
+    get_value, has_better_item, is_item_among_top_10_percent: latency of the preference queries, the item
+        being updated before each is_item_among_top_10_percent query so that the scores are refreshed
+    mailbox: Mailbox receive_messages & get_new_messages, per message
+    message_service: MessageService send_message & dispatch_messages between agent_count agents, per message
+    dialogue: complete dialogues of agent_count agents (majority rule) over 50 engines, per dialogue
+
+Every benchmark is run repeat times and its best time per operation (in seconds, lower is better) is kept,
+under a key like "preferences/n=1000" or "dialogue/agents=10".
+
+Results are saved as JSON baselines ({"metadata": {...}, "results": {key: seconds per operation}}), and the
+compare mode runs the suite again (or reads a second results file) and flags the benchmarks slower than the
+baseline by more than threshold (0.2: 20 % slower), exiting with status 1 if there is any.
+
+Run from the repository root:
+    python -m benchmarks.suite run [--quick] [--output benchmarks/baselines/baseline.json]
+    python -m benchmarks.suite compare [BASELINE [RESULTS]] [--quick] [--threshold 0.2]
+
+No baseline is committed, since timings depend on the machine: record one with run before comparing
+(compare reads benchmarks/baselines/baseline.json by default).
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+from mesa import Model
+from mesa.time import BaseScheduler
+
+from communication.agent.CommunicatingAgent import CommunicatingAgent
+from communication.logger.DialogueLogger import DialogueLogger
+from communication.mailbox.Mailbox import Mailbox
+from communication.message.Message import Message
+from communication.message.MessagePerformative import MessagePerformative
+from communication.message.MessageService import MessageService
+from communication.preferences.CriterionName import CriterionName
+from communication.preferences.EnginesCorpus import EnginesCorpus
+from communication.preferences.Preferences import Preferences
+from communication.preferences.Value import Value
+from pw_argumentation import ArgumentModel
+
+CORPUS_SIZES = (10, 100, 1000, 10 ** 4, 10 ** 5, 10 ** 6)
+AGENT_COUNTS = (2, 10, 100, 1000)
+QUICK_CORPUS_SIZES = (10, 1000, 10 ** 5)
+QUICK_AGENT_COUNTS = (2, 10, 100)
+
+# largest corpus built as engine objects, larger ones are only built columnar
+OBJECT_CORPUS_MAX_SIZE = 10 ** 5
+QUERY_COUNT = 200
+MESSAGE_COUNT = 20000
+DIALOGUE_CORPUS_SIZE = 50
+DIALOGUE_MAX_STEPS = 100
+
+DEFAULT_BASELINE = os.path.join('benchmarks', 'baselines', 'baseline.json')
+
+
+def best_time(function, repeat):
+    """Return the best time of repeat calls to function, its setup being done by the caller."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def build_corpus(corpus_size):
+    """Return the (columnar) engine list of a corpus and its name index."""
+    corpus = EnginesCorpus(corpus_size, columnar=True)
+    return corpus.generate_engines_list(), corpus.get_name_index()
+
+
+def bench_corpus(corpus_size, columnar, repeat):
+    """Seconds per EnginesCorpus construction."""
+    return best_time(lambda: EnginesCorpus(corpus_size, columnar=columnar).generate_engines_list(), repeat)
+
+
+def bench_preferences(corpus_size, repeat):
+    """Seconds per Preferences construction over a corpus."""
+    items, name_index = build_corpus(corpus_size)
+    rng = random.Random(0)
+    return best_time(lambda: Preferences(items, name_index=name_index, rng=rng), repeat)
+
+
+def bench_queries(corpus_size, repeat):
+    """Seconds per get_value, has_better_item and is_item_among_top_10_percent query, by query name."""
+    items, name_index = build_corpus(corpus_size)
+    preferences = Preferences(items, name_index=name_index, rng=random.Random(0))
+    rng = random.Random(1)
+    queried_items = [items[rng.randrange(len(items))] for _ in range(QUERY_COUNT)]
+    criteria = [rng.choice(list(CriterionName)) for _ in range(QUERY_COUNT)]
+    values = [rng.choice(list(Value)) for _ in range(QUERY_COUNT)]
+
+    def get_values():
+        for item, criterion in zip(queried_items, criteria):
+            preferences.get_value(item, criterion)
+
+    def has_better_items():
+        for item, criterion, value in zip(queried_items, criteria, values):
+            preferences.has_better_item(item, criterion, value, True)
+
+    def top_10_percent_queries():
+        # the item is updated before each query, so that the scores are refreshed as during a dialogue
+        for item in queried_items:
+            preferences.update_item(item)
+            preferences.is_item_among_top_10_percent(item)
+
+    return {
+        'get_value': best_time(get_values, repeat) / QUERY_COUNT,
+        'has_better_item': best_time(has_better_items, repeat) / QUERY_COUNT,
+        'is_item_among_top_10_percent': best_time(top_10_percent_queries, repeat) / QUERY_COUNT,
+    }
+
+
+def create_messages(agent_names, message_count):
+    """Return message_count messages sent around a ring of agents."""
+    return [
+        Message(agent_names[index % len(agent_names)], agent_names[(index + 1) % len(agent_names)],
+                MessagePerformative.INFORM_REF, index)
+        for index in range(message_count)
+    ]
+
+
+def bench_mailbox(repeat):
+    """Seconds per message received and read by a mailbox."""
+    messages = create_messages(('agent1', 'agent2'), MESSAGE_COUNT)
+    times = []
+    for _ in range(repeat):
+        mailbox = Mailbox()
+        start = time.perf_counter()
+        for message in messages:
+            mailbox.receive_messages(message)
+        mailbox.get_new_messages()
+        times.append(time.perf_counter() - start)
+    return min(times) / MESSAGE_COUNT
+
+
+def bench_message_service(agent_count, repeat):
+    """Seconds per message sent and dispatched (deferred delivery) between agent_count agents."""
+    agent_names = ArgumentModel.get_agent_names(agent_count)
+    messages = create_messages(agent_names, MESSAGE_COUNT)
+    times = []
+    for _ in range(repeat):
+        model = Model()
+        scheduler = BaseScheduler(model)
+        service = MessageService(scheduler, instant_delivery=False)
+        agents = [CommunicatingAgent(index, model, name, message_service=service)
+                  for index, name in enumerate(agent_names)]
+        for agent in agents:
+            scheduler.add(agent)
+        start = time.perf_counter()
+        for message in messages:
+            service.send_message(message)
+        service.dispatch_messages()
+        for agent in agents:
+            agent.get_new_messages()
+        times.append(time.perf_counter() - start)
+    return min(times) / MESSAGE_COUNT
+
+
+def bench_dialogue(agent_count, repeat):
+    """Seconds per complete dialogue of agent_count agents, model creation included (the same seeded dialogue
+    being run each time)."""
+    logger = DialogueLogger(level=DialogueLogger.OFF)
+    return best_time(lambda: ArgumentModel(
+        corpus_size=DIALOGUE_CORPUS_SIZE, seed=0, agent_count=agent_count, coalition_rule='majority',
+        logger=logger,
+    ).run_until_done(DIALOGUE_MAX_STEPS), repeat)
+
+
+def run_suite(corpus_sizes=CORPUS_SIZES, agent_counts=AGENT_COUNTS, repeat=3, report=None):
+    """Run the benchmarks, return {key: seconds per operation}. report(key, seconds) is called after each one."""
+    results = {}
+
+    def record(key, seconds):
+        results[key] = seconds
+        if report is not None:
+            report(key, seconds)
+
+    for corpus_size in corpus_sizes:
+        if corpus_size <= OBJECT_CORPUS_MAX_SIZE:
+            record('corpus/objects/n={}'.format(corpus_size), bench_corpus(corpus_size, False, repeat))
+        record('corpus/columnar/n={}'.format(corpus_size), bench_corpus(corpus_size, True, repeat))
+        record('preferences/n={}'.format(corpus_size), bench_preferences(corpus_size, repeat))
+        for query, seconds in bench_queries(corpus_size, repeat).items():
+            record('{}/n={}'.format(query, corpus_size), seconds)
+    record('mailbox', bench_mailbox(repeat))
+    for agent_count in agent_counts:
+        record('message_service/agents={}'.format(agent_count), bench_message_service(agent_count, repeat))
+    for agent_count in agent_counts:
+        record('dialogue/agents={}'.format(agent_count), bench_dialogue(agent_count, repeat))
+    return results
+
+
+def get_metadata():
+    """Return the description of the machine and the run, saved with the results."""
+    return {
+        'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+    }
+
+
+def save_results(results, path):
+    """Save results in a JSON baseline file."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as file:
+        json.dump({'metadata': get_metadata(), 'results': results}, file, indent=2, sort_keys=True)
+
+
+def load_results(path):
+    """Return the results of a JSON baseline file."""
+    with open(path) as file:
+        return json.load(file)['results']
+
+
+def compare(baseline, results, threshold=0.2):
+    """Return the comparison rows (key, baseline seconds, seconds, ratio, regression) of the benchmarks of both
+    results, a regression being a ratio above 1 + threshold."""
+    return [
+        (key, baseline[key], results[key], results[key] / baseline[key], results[key] > baseline[key] * (1 + threshold))
+        for key in results if key in baseline
+    ]
+
+
+def format_seconds(seconds):
+    """Return a duration with a readable unit."""
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return '{:.3f} {}'.format(seconds / scale, unit)
+    return '{:.1f} ns'.format(seconds / 1e-9)
+
+
+def print_result(key, seconds):
+    print('{:<48} {:>12}'.format(key, format_seconds(seconds)), flush=True)
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description='Benchmark suite of the dialogues.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    run_parser = commands.add_parser('run', help='run the suite and save the results as a baseline')
+    run_parser.add_argument('--output', default=DEFAULT_BASELINE)
+    compare_parser = commands.add_parser('compare', help='compare results with a baseline')
+    compare_parser.add_argument('baseline', nargs='?', default=DEFAULT_BASELINE,
+                                help='baseline file (default: {})'.format(DEFAULT_BASELINE))
+    compare_parser.add_argument('results', nargs='?', help='results file (the suite is run if not given)')
+    compare_parser.add_argument('--threshold', type=float, default=0.2)
+    compare_parser.add_argument('--output', help='save the new results in this file')
+    for command_parser in (run_parser, compare_parser):
+        command_parser.add_argument('--quick', action='store_true', help='smaller grid of sizes')
+        command_parser.add_argument('--repeat', type=int, default=3)
+    arguments = parser.parse_args(arguments)
+
+    corpus_sizes, agent_counts = (QUICK_CORPUS_SIZES, QUICK_AGENT_COUNTS) if arguments.quick else \
+        (CORPUS_SIZES, AGENT_COUNTS)
+    if arguments.command == 'run':
+        save_results(run_suite(corpus_sizes, agent_counts, arguments.repeat, print_result), arguments.output)
+        print('Results saved in {}'.format(arguments.output))
+        return 0
+
+    if not os.path.exists(arguments.baseline):
+        # no baseline is committed, the timings depending on the machine
+        compare_parser.error("no baseline {}: record one on this machine first with "
+                     "'python -m benchmarks.suite run{} --output {}'".format(
+                         arguments.baseline, ' --quick' if arguments.quick else '', arguments.baseline))
+    baseline = load_results(arguments.baseline)
+    if arguments.results:
+        results = load_results(arguments.results)
+    else:
+        results = run_suite(corpus_sizes, agent_counts, arguments.repeat)
+        if arguments.output:
+            save_results(results, arguments.output)
+    rows = compare(baseline, results, arguments.threshold)
+    print('{:<48} {:>12} {:>12} {:>8}'.format('benchmark', 'baseline', 'current', 'ratio'))
+    for key, baseline_seconds, seconds, ratio, regression in rows:
+        flag = '  REGRESSION' if regression else ''
+        print('{:<48} {:>12} {:>12} {:>8.2f}{}'.format(
+            key, format_seconds(baseline_seconds), format_seconds(seconds), ratio, flag))
+    regression_count = sum(row[4] for row in rows)
+    print('{} regression(s) beyond {:.0%} out of {} benchmarks'.format(
+        regression_count, arguments.threshold, len(rows)))
+    return 1 if regression_count else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -19,19 +19,53 @@ class CommunicatingAgent(Agent):
         message_service: The message service used to send and receive message (MessageService)
     """
 
-    def __init__(self, unique_id, model, name):
+    def __init__(self, unique_id, model, name, history_size=None, archive_path=None, message_service=None):
         """ Create a new communicating agent.
+
+        history_size bounds the number of read messages kept in memory, older ones being archived on disk
+        (in archive_path, or a temporary file), see Mailbox.
+        The message service is the given one, else the one of the model (its message_service attribute),
+        else the last created one. The agent is routed by its name in the message service.
         """
         super().__init__(unique_id, model)
         self.__name = name
-        self.__mailbox = Mailbox()
-        self.__messages_service = MessageService.get_instance()
+        self.__mailbox = Mailbox(history_size, archive_path)
+        if message_service is None:
+            message_service = getattr(model, 'message_service', None) or MessageService.get_instance()
+        self.__messages_service = message_service
+        if message_service is not None:
+            message_service.add_route(self)
 
     def step(self):
         """ The step methods of the agent called by the scheduler at each time tick.
         """
         super().step()
 
+    async def async_step(self):
+        """ The step method of the agent when run as a coroutine, called once at start (unless messages are
+        already waiting) and then for each message received. Override it to await slow services.
+        """
+        self.step()
+
+    async def run(self, max_steps=None):
+        """ Run the agent as a coroutine awaiting its messages, until the dialogue is over or max_steps steps
+        were made.
+
+        Needs an AsyncMessageService, the agents being started together by its run_agents method.
+        """
+        step_count = 0
+        if self.__messages_service.get_inbox(self.__name).empty():
+            await self.async_step()
+            step_count += 1
+        while max_steps is None or step_count < max_steps:
+            message = await self.__messages_service.receive(self)
+            if message is None:
+                return
+            self.receive_message(message)
+            await self.async_step()
+            step_count += 1
+        self.__messages_service.stop(self)
+
     def get_name(self):
         """ Return the name of the communicating agent."""
         return self.__name
@@ -41,6 +75,11 @@ class CommunicatingAgent(Agent):
         """
         self.__mailbox.receive_messages(message)
 
+    def receive_message_batch(self, messages):
+        """ Receive several messages at once (called by the MessageService object) and store them in the mailbox.
+        """
+        self.__mailbox.receive_message_batch(messages)
+
     def send_message(self, message):
         """ Send message through the MessageService object.
         """
@@ -51,17 +90,27 @@ class CommunicatingAgent(Agent):
         """
         return self.__mailbox.get_new_messages()
 
-    def get_messages(self):
+    def get_messages(self, full_history=False):
         """ Return all the received messages.
         """
-        return self.__mailbox.get_messages()
+        return self.__mailbox.get_messages(full_history)
 
-    def get_messages_from_performative(self, performative):
+    def get_messages_from_performative(self, performative, full_history=False):
         """ Return a list of messages which have the same performative.
         """
-        return self.__mailbox.get_messages_from_performative(performative)
+        return self.__mailbox.get_messages_from_performative(performative, full_history)
 
-    def get_messages_from_exp(self, exp):
+    def get_messages_from_exp(self, exp, full_history=False):
         """ Return a list of messages which have the same sender.
         """
-        return self.__mailbox.get_messages_from_exp(exp)
+        return self.__mailbox.get_messages_from_exp(exp, full_history)
+
+    def get_messages_from_performative_and_exp(self, performative, exp, full_history=False):
+        """ Return a list of messages which have the same performative and the same sender.
+        """
+        return self.__mailbox.get_messages_from_performative_and_exp(performative, exp, full_history)
+
+    def close_mailbox(self):
+        """ Close the mailbox archive, if any.
+        """
+        self.__mailbox.close()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+import json
+import sys
+
+from communication.message.MessagePerformative import MessagePerformative
+
+
+class DialogueLogger:
+    """DialogueLogger class.
+    Class implementing the log of the dialogue events: the messages sent (level INFO) and the status of the
+    agents waiting or done (level DEBUG).
+
+    Records are kept as is in a buffer, and only formatted when it is flushed (every buffer_size records,
+    or by flush): nothing is formatted for the records below the level, which are dropped right away.
+    Records are written as text lines (the transcript format) or as JSON lines with the fields step,
+    sender, receiver, performative and content for messages, step, agent, status and interlocutor for status.
+
+    attr:
+        stream: the file records are written to (sys.stdout when written if None)
+        level: the minimum level of the records kept (int)
+        buffer_size: the number of records buffered before they are written (int)
+        record_format: TEXT or JSON
+        buffer: the records not written yet (list)
+    """
+
+    DEBUG = 10
+    INFO = 20
+    OFF = 100
+
+    TEXT = 'text'
+    JSON = 'json'
+
+    # agent status
+    WAITING = 'waiting'
+    AGREED = 'agreed'
+
+    STATUS_TEXT = {
+        WAITING: 'Stand by, waiting for answers from {}',
+        AGREED: 'Stand by, has agreed with {}',
+    }
+
+    def __init__(self, stream=None, level=DEBUG, buffer_size=1, record_format=TEXT):
+        """ Create a new dialogue logger.
+        """
+        if record_format not in (DialogueLogger.TEXT, DialogueLogger.JSON):
+            raise ValueError("unknown record format {}".format(record_format))
+        self.__stream = stream
+        self.level = level
+        self.__buffer_size = buffer_size
+        self.__record_format = record_format
+        self.__buffer = []
+
+    def is_enabled(self, level):
+        """ Return True if the records of the given level are kept.
+        """
+        return level >= self.level
+
+    def log_message(self, step, message):
+        """ Log a message sent during the given step.
+        """
+        if self.level > DialogueLogger.INFO:
+            return
+        self.__buffer.append((step, message))
+        if len(self.__buffer) >= self.__buffer_size:
+            self.flush()
+
+    def log_status(self, step, agent_name, status, interlocutor):
+        """ Log the status (WAITING or AGREED) of an agent during the given step.
+        """
+        if self.level > DialogueLogger.DEBUG:
+            return
+        self.__buffer.append((step, agent_name, status, interlocutor))
+        if len(self.__buffer) >= self.__buffer_size:
+            self.flush()
+
+    def flush(self):
+        """ Write the buffered records.
+        """
+        if not self.__buffer:
+            return
+        records, self.__buffer = self.__buffer, []
+        format_record = self.__format_json if self.__record_format == DialogueLogger.JSON else self.__format_text
+        stream = self.__stream if self.__stream is not None else sys.stdout
+        stream.write(''.join([format_record(record) + '\n' for record in records]))
+
+    def close(self):
+        """ Write the buffered records and close the stream, if any.
+        """
+        self.flush()
+        if self.__stream is not None:
+            self.__stream.close()
+
+    @staticmethod
+    def __format_text(record):
+        if len(record) == 2:
+            _, message = record
+            if message.get_performative() == MessagePerformative.STAND_BY:
+                return '{}  -  {}'.format(
+                    message.get_exp(), DialogueLogger.STATUS_TEXT[DialogueLogger.WAITING].format(message.get_dest()))
+            return '{}  -  {} ( {} )'.format(message.get_exp(), message.get_performative(), message.get_content())
+        _, agent_name, status, interlocutor = record
+        return '{}  -  {}'.format(agent_name, DialogueLogger.STATUS_TEXT[status].format(interlocutor))
+
+    @staticmethod
+    def __format_json(record):
+        if len(record) == 2:
+            step, message = record
+            content = message.get_content()
+            return json.dumps({
+                'step': step,
+                'sender': message.get_exp(),
+                'receiver': message.get_dest(),
+                'performative': message.get_performative().name,
+                'content': content if content is None or isinstance(content, int) else str(content),
+            })
+        step, agent_name, status, interlocutor = record
+        return json.dumps({'step': step, 'agent': agent_name, 'status': status, 'interlocutor': interlocutor})
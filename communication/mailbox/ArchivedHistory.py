@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+from collections import deque
+
+from communication.mailbox.MessageArchive import MessageArchive
+
+
+class ArchivedHistory:
+    """ArchivedHistory class.
+    Append-only history keeping its last history_size entries in memory, older ones being spilled to a
+    MessageArchive on disk, as the read messages of a bounded Mailbox.
+
+    Iterating over the history streams all the entries since its creation, the archived ones first.
+
+    attr:
+        history_size: The maximum number of entries kept in memory
+        recent_entries: The last entries (ring buffer)
+        archive: The MessageArchive of the spilled entries
+     """
+
+    def __init__(self, history_size, archive_path=None):
+        """ Create a new ArchivedHistory.
+        """
+        self.__history_size = history_size
+        self.__recent_entries = deque()
+        self.__archive = MessageArchive(archive_path)
+
+    def append(self, entry):
+        """ Add an entry at the end of the history, spilling the oldest one in memory if needed.
+        """
+        self.__recent_entries.append(entry)
+        if len(self.__recent_entries) > self.__history_size:
+            self.__archive.append(self.__recent_entries.popleft())
+
+    def get_recent_entries(self):
+        """ Return the entries kept in memory, from the oldest one.
+        """
+        return list(self.__recent_entries)
+
+    def __iter__(self):
+        """ Stream all the entries, from the oldest one.
+        """
+        yield from self.__archive
+        yield from list(self.__recent_entries)
+
+    def __len__(self):
+        return len(self.__archive) + len(self.__recent_entries)
+
+    def close(self):
+        """ Close the archive, and remove its file if it is a temporary one.
+        """
+        self.__archive.close()
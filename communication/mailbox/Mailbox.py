@@ -1,58 +1,136 @@
 #!/usr/bin/env python3
 
+from collections import defaultdict, deque
+
+from communication.mailbox.MessageArchive import MessageArchive
+
 
 class Mailbox:
     """Mailbox class.
     Class implementing the mailbox object which manages messages in communicating agents.
 
+    Secondary indexes by performative, by sender and by both give each query in O(result size).
+
+    In bounded mode (history_size given), only the last history_size read messages are kept in memory, as ring
+    buffers: older ones are spilled to an append-only MessageArchive on disk, whose file is only created by the
+    first spill. Queries then only return the messages in memory, unless full_history is asked, in which case
+    the archive is streamed first.
+
     attr:
         unread_messages: The list of unread messages
-        read_messages: The list of read messages
+        read_messages: The list (ring buffer in bounded mode) of read messages
+        messages_by_performative: The messages in memory by performative
+        messages_by_exp: The messages in memory by sender
+        messages_by_performative_and_exp: The messages in memory by (performative, sender)
+        history_size: The maximum number of read messages kept in memory (None for no limit)
+        archive: The MessageArchive of the spilled messages (bounded mode only)
      """
 
-    def __init__(self):
+    def __init__(self, history_size=None, archive_path=None):
         """ Create a new Mailbox.
         """
+        self.__history_size = history_size
+        self.__archive = None
+        if history_size is not None:
+            self.__archive = MessageArchive(archive_path)
+        container = list if history_size is None else deque
         self.__unread_messages = []
-        self.__read_messages = []
+        self.__read_messages = container()
+        self.__messages_by_performative = defaultdict(container)
+        self.__messages_by_exp = defaultdict(container)
+        self.__messages_by_performative_and_exp = defaultdict(container)
 
     def receive_messages(self, message):
         """ Receive a message and add it in the unread messages list.
         """
-        self.__unread_messages.append(message)
+        self.receive_message_batch((message,))
+
+    def receive_message_batch(self, messages):
+        """ Receive several messages and add them in the unread messages list.
+        """
+        self.__unread_messages.extend(messages)
+        for message in messages:
+            performative = message.get_performative()
+            exp = message.get_exp()
+            self.__messages_by_performative[performative].append(message)
+            self.__messages_by_exp[exp].append(message)
+            self.__messages_by_performative_and_exp[(performative, exp)].append(message)
 
     def get_new_messages(self):
         """ Return all the messages from unread messages list.
         """
-        unread_messages = self.__unread_messages.copy()
-        if len(unread_messages) > 0:
-            for messages in unread_messages:
-                self.__read_messages.append(messages)
-
-        self.__unread_messages.clear()
+        unread_messages = self.__unread_messages
+        if unread_messages:
+            self.__unread_messages = []
+            self.__read_messages.extend(unread_messages)
+            self.__spill()
         return unread_messages
 
-    def get_messages(self):
+    def __spill(self):
+        """ Move the oldest read messages beyond the history size to the archive.
+
+        Messages are spilled from the oldest one, which is also the oldest one of each index.
+        """
+        if self.__history_size is None:
+            return
+        spilled_messages = []
+        while len(self.__read_messages) > self.__history_size:
+            message = self.__read_messages.popleft()
+            performative = message.get_performative()
+            exp = message.get_exp()
+            self.__messages_by_performative[performative].popleft()
+            self.__messages_by_exp[exp].popleft()
+            self.__messages_by_performative_and_exp[(performative, exp)].popleft()
+            spilled_messages.append(message)
+        if spilled_messages:
+            self.__archive.extend(spilled_messages)
+
+    def __with_history(self, messages, full_history, accept):
+        """ Return the messages in memory, or a generator of the full history (archive first) if asked.
+        """
+        if not full_history or self.__archive is None:
+            return list(messages)
+        return self.__stream_history(messages, accept)
+
+    def __stream_history(self, messages, accept):
+        for message in self.__archive:
+            if accept(message):
+                yield message
+        yield from list(messages)
+
+    def get_messages(self, full_history=False):
         """ Return all the messages from both unread and read messages list.
+
+        In bounded mode, only the messages in memory are returned unless full_history is True:
+        a generator streaming all the messages since the creation of the mailbox is returned.
         """
-        if len(self.__unread_messages) > 0:
-            self.get_new_messages()
-        return self.__read_messages
+        self.get_new_messages()
+        if self.__history_size is None:
+            return self.__read_messages
+        return self.__with_history(self.__read_messages, full_history, lambda message: True)
 
-    def get_messages_from_performative(self, performative):
+    def get_messages_from_performative(self, performative, full_history=False):
         """ Return a list of messages which have the same performative.
         """
-        messages_from_performative = []
-        for message in self.__unread_messages + self.__read_messages:
-            if message.get_performative() == performative:
-                messages_from_performative.append(message)
-        return messages_from_performative
+        messages = self.__messages_by_performative.get(performative, ())
+        return self.__with_history(messages, full_history,
+                                   lambda message: message.get_performative() == performative)
 
-    def get_messages_from_exp(self, exp):
+    def get_messages_from_exp(self, exp, full_history=False):
         """ Return a list of messages which have the same sender.
         """
-        messages_from_exp = []
-        for message in self.__unread_messages + self.__read_messages:
-            if message.get_exp() == exp:
-                messages_from_exp.append(message)
-        return messages_from_exp
+        messages = self.__messages_by_exp.get(exp, ())
+        return self.__with_history(messages, full_history, lambda message: message.get_exp() == exp)
+
+    def get_messages_from_performative_and_exp(self, performative, exp, full_history=False):
+        """ Return a list of messages which have the same performative and the same sender.
+        """
+        messages = self.__messages_by_performative_and_exp.get((performative, exp), ())
+        return self.__with_history(messages, full_history,
+                                   lambda message: message.get_performative() == performative and message.get_exp() == exp)
+
+    def close(self):
+        """ Close the archive of a bounded mailbox.
+        """
+        if self.__archive is not None:
+            self.__archive.close()
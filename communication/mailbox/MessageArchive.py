@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+import os
+import pickle
+import tempfile
+import weakref
+
+
+class MessageArchive:
+    """MessageArchive class.
+    Append-only on-disk archive of messages (or any picklable entries), read back by streaming.
+
+    The archive file is only created by the first append, and it is opened for each append and each read:
+    an archive holds no file descriptor, so that many agents can each have one.
+
+    attr:
+        path: The path of the archive file (a temporary file removed on close if not given, None until
+            the first append)
+        count: The number of archived messages
+     """
+
+    def __init__(self, path=None):
+        """ Create a new MessageArchive.
+        """
+        self.path = path
+        self.count = 0
+        self.__finalizer = None
+
+    def __create_file(self):
+        """ Create the temporary archive file, removed on close() or when the archive is garbage collected.
+        """
+        handle, self.path = tempfile.mkstemp(prefix='mailbox-', suffix='.archive')
+        os.close(handle)
+        self.__finalizer = weakref.finalize(self, os.remove, self.path)
+
+    def append(self, message):
+        """ Append a message at the end of the archive.
+        """
+        self.extend((message,))
+
+    def extend(self, messages):
+        """ Append several messages at the end of the archive, the file being opened once.
+        """
+        if self.path is None:
+            self.__create_file()
+        # a file given by path is overwritten by the first append, the archive starting empty
+        with open(self.path, 'ab' if self.count else 'wb') as archive:
+            for message in messages:
+                pickle.dump(message, archive, pickle.HIGHEST_PROTOCOL)
+                self.count += 1
+
+    def __iter__(self):
+        """ Stream the archived messages, from the oldest one.
+        """
+        if self.count == 0:
+            return
+        with open(self.path, 'rb') as archive:
+            for _ in range(self.count):
+                yield pickle.load(archive)
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        """ Close the archive, and remove its file if it is a temporary one.
+        """
+        if self.__finalizer is not None:
+            self.__finalizer()
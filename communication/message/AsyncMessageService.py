@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+import asyncio
+
+from communication.message.MessageService import MessageService
+
+
+class AsyncMessageService(MessageService):
+    """AsyncMessageService class.
+    Message service running the communicating agents as coroutines on an asyncio event loop.
+
+    Sending a message only enqueues it in the inbox (asyncio.Queue) of its destination, the destination agent
+    being woken up to handle it. Agents are started with run_agents and stop when the dialogue is over: every
+    running agent waits for a message and none is left to be handled. They can also be limited to a number of
+    steps, as dialogues are not guaranteed to end.
+
+    Several services, i.e. several models, can run their agents concurrently on the same event loop.
+
+    attr:
+        inboxes: the queues of messages not yet handled by destination name (dict)
+        running: the names of the agents running (set)
+        waiting: the number of running agents waiting for a message (int)
+        pending: the number of messages sent to running agents and not yet handled (int)
+    """
+
+    def __init__(self, scheduler):
+        """ Create a new AsyncMessageService object.
+        """
+        super().__init__(scheduler)
+        self.__inboxes = {}
+        self.__running = set()
+        self.__waiting = 0
+        self.__pending = 0
+
+    def get_inbox(self, agent_name):
+        """ Return the queue of the messages sent to the agent and not yet handled.
+        """
+        inbox = self.__inboxes.get(agent_name)
+        if inbox is None:
+            inbox = self.__inboxes[agent_name] = asyncio.Queue()
+        return inbox
+
+    def send_message(self, message):
+        """ Enqueue the message in the inbox of its destination, without waiting for it to be handled.
+        """
+        self.dispatch_message(message)
+
+    def dispatch_message(self, message):
+        """ Enqueue the message in the inbox of its destination.
+        """
+        agent_name = message.get_dest()
+        if agent_name in self.__running:
+            self.__pending += 1
+        self.get_inbox(agent_name).put_nowait(message)
+
+    async def receive(self, agent):
+        """ Wait for the next message sent to the agent.
+
+        Return None when the dialogue is over, i.e. when all the running agents are waiting with empty inboxes.
+        """
+        inbox = self.get_inbox(agent.get_name())
+        if inbox.empty():
+            self.__waiting += 1
+            self.__end_if_over()
+            message = await inbox.get()
+            self.__waiting -= 1
+        else:
+            message = inbox.get_nowait()
+        if message is not None:
+            self.__pending -= 1
+        return message
+
+    def stop(self, agent):
+        """ Stop handling the messages of an agent which stopped before the end of the dialogue.
+        """
+        self.__running.discard(agent.get_name())
+        self.__pending -= self.get_inbox(agent.get_name()).qsize()
+        self.__end_if_over()
+
+    def __end_if_over(self):
+        """ Wake the running agents up with None if they all wait and no message is left to be handled.
+        """
+        if self.__waiting == len(self.__running) and self.__pending == 0:
+            for agent_name in self.__running:
+                self.get_inbox(agent_name).put_nowait(None)
+
+    async def run_agents(self, agents, max_steps=None):
+        """ Run the agents as coroutines until the dialogue is over, or each of them made max_steps steps.
+        """
+        agents = list(agents)
+        for agent in agents:
+            self.__running.add(agent.get_name())
+            self.__pending += self.get_inbox(agent.get_name()).qsize()
+        try:
+            await asyncio.gather(*(agent.run(max_steps) for agent in agents))
+        finally:
+            for agent in agents:
+                self.__running.discard(agent.get_name())
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+import struct
+
+from arguments.ArgumentPayload import ArgumentPayload
+from arguments.Comparison import Comparison
+from arguments.CoupleValue import CoupleValue
+from communication.message.Message import Message
+from communication.message.MessagePerformative import MessagePerformative
+from communication.message.SymbolTable import SymbolTable
+from communication.preferences.CriterionName import CriterionName
+from communication.preferences.Value import Value
+
+
+class MessageCodec:
+    """MessageCodec class.
+    Class implementing the compact binary encoding of messages, to store or ship many of them.
+
+    Each message is a fixed size record (RECORD, 22 bytes) made of integer ids: agents, items and texts are
+    given ids by a symbol table shared by the encoder and the decoder, performatives, criteria and values are
+    encoded by their enum value (criteria up to MAX_CRITERION). Integer contents outside the int32 range are
+    stored in the symbol table as their text. Messages are encoded and decoded in bulk over buffers, records being packed
+    into and unpacked from the buffer in place.
+
+    Record fields: sender, receiver, performative, content kind, content (symbol id or integer), argument flags
+    (decision, comparison), couple value criterion and value, comparison best and worst criteria.
+
+    attr:
+        symbols: the symbol table (SymbolTable)
+        criteria: the criteria by enum value (dict)
+    """
+
+    RECORD = struct.Struct('<IIBBiBHBHH')
+    HEADER = struct.Struct('<I')
+
+    NO_CONTENT = 0
+    SYMBOL = 1
+    INTEGER = 2
+    ARGUMENT = 3
+    BIG_INTEGER = 4
+
+    MIN_INTEGER = -2 ** 31
+    MAX_INTEGER = 2 ** 31 - 1
+    MAX_CRITERION = 2 ** 16 - 1
+
+    DECISION = 1
+    COMPARISON = 2
+
+    def __init__(self, symbols=None, criteria=CriterionName):
+        """ Create a new codec, with a new symbol table unless one is given.
+        """
+        self.__symbols = symbols if symbols is not None else SymbolTable()
+        self.__criteria = {criterion.value: criterion for criterion in criteria}
+
+    def get_symbols(self):
+        """ Return the symbol table of the codec.
+        """
+        return self.__symbols
+
+    def encode(self, messages):
+        """ Return the messages encoded in a new bytearray.
+        """
+        messages = list(messages)
+        buffer = bytearray(len(messages) * MessageCodec.RECORD.size)
+        self.encode_into(messages, buffer)
+        return buffer
+
+    def encode_into(self, messages, buffer, offset=0):
+        """ Encode the messages in buffer (writable bytes-like object) from offset, return the end offset.
+        """
+        pack_into = MessageCodec.RECORD.pack_into
+        size = MessageCodec.RECORD.size
+        get_id = self.__symbols.get_id
+        for message in messages:
+            content = message.get_content()
+            flags = criterion = value = best = worst = 0
+            if content is None:
+                kind, content_id = MessageCodec.NO_CONTENT, 0
+            elif isinstance(content, str):
+                kind, content_id = MessageCodec.SYMBOL, get_id(content)
+            elif isinstance(content, int):
+                if MessageCodec.MIN_INTEGER <= content <= MessageCodec.MAX_INTEGER:
+                    kind, content_id = MessageCodec.INTEGER, content
+                else:
+                    kind, content_id = MessageCodec.BIG_INTEGER, get_id(str(content))
+            elif isinstance(content, ArgumentPayload):
+                kind, content_id = MessageCodec.ARGUMENT, get_id(content.item_name)
+                flags = MessageCodec.DECISION if content.boolean_decision else 0
+                criterion = content.couple_value.criterion_name.value
+                value = content.couple_value.value.value
+                if content.comparison is not None:
+                    flags |= MessageCodec.COMPARISON
+                    best = content.comparison.best_criterion_name.value
+                    worst = content.comparison.worst_criterion_name.value
+                if max(criterion, best, worst) > MessageCodec.MAX_CRITERION:
+                    raise ValueError("can not encode criteria beyond {}: {}".format(
+                        MessageCodec.MAX_CRITERION, max(criterion, best, worst)))
+            else:
+                raise TypeError("can not encode message content of type {}".format(type(content).__name__))
+            pack_into(
+                buffer, offset, get_id(message.get_exp()), get_id(message.get_dest()),
+                message.get_performative().value, kind, content_id, flags, criterion, value, best, worst,
+            )
+            offset += size
+        return offset
+
+    def iter_decode(self, buffer):
+        """ Iterate over the messages encoded in buffer (bytes-like object), without copying it.
+        """
+        get_symbol = self.__symbols.get_symbol
+        criteria = self.__criteria
+        for sender, receiver, performative, kind, content_id, flags, criterion, value, best, worst in \
+                MessageCodec.RECORD.iter_unpack(memoryview(buffer)):
+            if kind == MessageCodec.SYMBOL:
+                content = get_symbol(content_id)
+            elif kind == MessageCodec.INTEGER:
+                content = content_id
+            elif kind == MessageCodec.BIG_INTEGER:
+                content = int(get_symbol(content_id))
+            elif kind == MessageCodec.ARGUMENT:
+                comparison = None
+                if flags & MessageCodec.COMPARISON:
+                    comparison = Comparison(criteria[best], criteria[worst])
+                content = ArgumentPayload(
+                    bool(flags & MessageCodec.DECISION), get_symbol(content_id),
+                    CoupleValue(criteria[criterion], Value(value)), comparison,
+                )
+            else:
+                content = None
+            yield Message(get_symbol(sender), get_symbol(receiver), MessagePerformative(performative), content)
+
+    def decode(self, buffer):
+        """ Return the list of the messages encoded in buffer (bytes-like object).
+        """
+        return list(self.iter_decode(buffer))
+
+    def dump(self, messages, file):
+        """ Write the symbol table and the encoded messages in a binary file.
+        """
+        records = self.encode(messages)
+        symbols = self.__symbols.encode()
+        file.write(MessageCodec.HEADER.pack(len(symbols)))
+        file.write(symbols)
+        file.write(records)
+
+    @staticmethod
+    def load(file, criteria=CriterionName):
+        """ Return the messages written in a binary file by dump.
+        """
+        buffer = memoryview(file.read())
+        (symbols_size,) = MessageCodec.HEADER.unpack_from(buffer)
+        symbols_end = MessageCodec.HEADER.size + symbols_size
+        codec = MessageCodec(SymbolTable.decode(buffer[MessageCodec.HEADER.size:symbols_end]), criteria)
+        return codec.decode(buffer[symbols_end:])
@@ -1,34 +1,52 @@
 #!/usr/bin/env python3
+from collections import defaultdict
 
 class MessageService:
     """MessageService class.
     Class implementing the message service used to dispatch messages between communicating agents.
 
-    Not intended to be created more than once: it's a singleton.
+    Each model creates its own message service, so several models can live in the same process. get_instance
+    returns the last created one, for code written when the service was a singleton.
+
+    Agents are found through a name -> agent routing table: the agents already in the scheduler when the
+    service is created, then each communicating agent created with the service (see CommunicatingAgent),
+    an agent leaving the dialogue being unrouted by remove_route. Deferred messages are queued per destination and delivered in batch to each mailbox.
 
     attr:
         scheduler: the scheduler of the sma (Scheduler)
-        messages_to_proceed: the list of message to proceed mailbox of the agent (list)
+        messages_to_proceed: the lists of messages to proceed by destination name (dict)
+        routes: the agents by name (dict)
+        sent_count: the number of messages sent through the service (int)
     """
 
     __instance = None
 
     @staticmethod
     def get_instance():
-        """ Static access method.
+        """ Static access method, returns the last created message service.
         """
         return MessageService.__instance
 
     def __init__(self, scheduler, instant_delivery=True):
         """ Create a new MessageService object.
         """
-        if MessageService.__instance is not None:
-            raise Exception("This class is a singleton!")
-        else:
-            MessageService.__instance = self
-            self.__scheduler = scheduler
-            self.__instant_delivery = instant_delivery
-            self.__messages_to_proceed = []
+        MessageService.__instance = self
+        self.__scheduler = scheduler
+        self.__instant_delivery = instant_delivery
+        self.__messages_to_proceed = defaultdict(list)
+        self.__routes = {agent.get_name(): agent for agent in scheduler.agents}
+        self.__sent_count = 0
+
+    def add_route(self, agent):
+        """ Make an agent reachable by its name.
+        """
+        self.__routes[agent.get_name()] = agent
+
+    def remove_route(self, agent):
+        """ Make an agent unreachable by its name.
+        """
+        if self.__routes.get(agent.get_name()) is agent:
+            del self.__routes[agent.get_name()]
 
     def set_instant_delivery(self, instant_delivery):
         """ Set the instant delivery parameter.
@@ -38,10 +56,16 @@ class MessageService:
     def send_message(self, message):
         """ Dispatch message if instant delivery active, otherwise add the message to proceed list.
         """
+        self.__sent_count += 1
         if self.__instant_delivery:
             self.dispatch_message(message)
         else:
-            self.__messages_to_proceed.append(message)
+            self.__messages_to_proceed[message.get_dest()].append(message)
+
+    def get_sent_count(self):
+        """ Return the number of messages sent through the service.
+        """
+        return self.__sent_count
 
     def dispatch_message(self, message):
         """ Dispatch the message to the right agent.
@@ -50,16 +74,16 @@ class MessageService:
 
     def dispatch_messages(self):
         """ Proceed each message received by the message service.
+        
+        The messages of each destination are delivered in one batch, in the order they were sent.
         """
-        if len(self.__messages_to_proceed) > 0:
-            for message in self.__messages_to_proceed:
-                self.dispatch_message(message)
-
-        self.__messages_to_proceed.clear()
+        if self.__messages_to_proceed:
+            messages_to_proceed = self.__messages_to_proceed
+            self.__messages_to_proceed = defaultdict(list)
+            for agent_name, messages in messages_to_proceed.items():
+                self.find_agent_from_name(agent_name).receive_message_batch(messages)
 
     def find_agent_from_name(self, agent_name):
-        """ Return the agent according to the agent name given.
+        """ Return the agent according to the agent name given, None if no agent is routed under this name.
         """
-        for agent in self.__scheduler.agents:
-            if agent.get_name() == agent_name:
-                return agent
+        return self.__routes.get(agent_name)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+import multiprocessing
+from collections import defaultdict, deque
+
+from communication.message.MessageService import MessageService
+
+
+class ProcessMessageService(MessageService):
+    """ProcessMessageService class.
+    Message service of one worker process of a system whose agents are partitioned across processes.
+
+    Each worker has an inbox (multiprocessing.Queue) in which the other workers put the messages sent to its
+    agents. Every message, to a local or a remote agent, is delivered at the beginning of the next step, so that
+    the agents receive the same messages whatever the worker they live in.
+
+    The workers step in lockstep: dispatch_messages, called at the beginning of each step, sends to every other
+    worker the batch of the messages sent to its agents during the step (possibly empty, it is the end of step
+    marker) and waits for their batches. The messages of all the workers are then delivered in the order their
+    senders were activated (see set_sender_order), each sender's messages in the order they were sent: the
+    mailboxes get the same messages in the same order as with one deferred MessageService, whatever the number
+    of workers.
+
+    attr:
+        worker_id: the index of the worker (int)
+        routes: the worker index of each agent by name (dict)
+        inboxes: the inboxes of all the workers, indexed by worker (list)
+        outboxes: the messages sent during the step, by destination worker (list)
+        pending_batches: the batches received from each worker and not delivered yet, oldest first (list)
+        sender_ranks: the activation rank of each sender during the step, by name (dict, None for the
+            worker order)
+        sent_count: the number of messages sent by the agents of this worker (int)
+    """
+
+    @staticmethod
+    def create_inboxes(worker_count, context=None):
+        """ Create the inboxes of worker_count workers, to be given to each of them.
+        """
+        context = context or multiprocessing.get_context()
+        return [context.Queue() for _ in range(worker_count)]
+
+    def __init__(self, scheduler, worker_id, routes, inboxes):
+        """ Create a new ProcessMessageService object.
+        """
+        super().__init__(scheduler, instant_delivery=False)
+        self.__worker_id = worker_id
+        self.__routes = routes
+        self.__inboxes = inboxes
+        self.__outboxes = [[] for _ in inboxes]
+        self.__pending_batches = [deque() for _ in inboxes]
+        self.__sender_ranks = None
+        self.__sent_count = 0
+
+    def get_worker_id(self):
+        """ Return the index of the worker.
+        """
+        return self.__worker_id
+
+    def is_local(self, agent_name):
+        """ Return True if the agent lives in this worker (agents without route being local).
+        """
+        return self.__routes.get(agent_name, self.__worker_id) == self.__worker_id
+
+    def set_instant_delivery(self, instant_delivery):
+        """ Messages are always delivered at the beginning of the next step.
+        """
+        if instant_delivery:
+            raise ValueError("the messages of agents partitioned across processes can not be delivered instantly")
+
+    def set_sender_order(self, agent_names):
+        """ Set the order in which the agents of all the workers were activated during the step, the same in
+        every worker: their messages are delivered in this order.
+        """
+        self.__sender_ranks = {agent_name: rank for rank, agent_name in enumerate(agent_names)}
+
+    def send_message(self, message):
+        """ Queue the message for the worker of its destination, it is delivered at the beginning of the next step.
+        """
+        self.__sent_count += 1
+        self.__outboxes[self.__routes.get(message.get_dest(), self.__worker_id)].append(message)
+
+    def get_sent_count(self):
+        """ Return the number of messages sent by the agents of this worker, to local or remote agents.
+        """
+        return self.__sent_count
+
+    def dispatch_messages(self):
+        """ Wait for the other workers to end their step, then deliver their messages and the local ones.
+        """
+        outboxes, self.__outboxes = self.__outboxes, [[] for _ in self.__inboxes]
+        for worker_id, inbox in enumerate(self.__inboxes):
+            if worker_id != self.__worker_id:
+                inbox.put((self.__worker_id, outboxes[worker_id]))
+        self.__pending_batches[self.__worker_id].append(outboxes[self.__worker_id])
+        inbox = self.__inboxes[self.__worker_id]
+        while not all(self.__pending_batches):
+            # a worker already ahead may have sent the batch of its next step too
+            worker_id, batch = inbox.get()
+            self.__pending_batches[worker_id].append(batch)
+        messages = [message for batches in self.__pending_batches for message in batches.popleft()]
+        if self.__sender_ranks is not None:
+            messages.sort(key=lambda message: self.__sender_ranks.get(message.get_exp(), len(self.__sender_ranks)))
+        messages_to_proceed = defaultdict(list)
+        for message in messages:
+            messages_to_proceed[message.get_dest()].append(message)
+        for agent_name, messages in messages_to_proceed.items():
+            self.find_agent_from_name(agent_name).receive_message_batch(messages)
+
+    def close(self):
+        """ Deliver the messages of the last step, the other workers doing so too, so that no message is left
+        in the inboxes when the workers exit.
+        """
+        self.dispatch_messages()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+import struct
+
+
+class SymbolTable:
+    """SymbolTable class.
+    Class implementing the table giving an integer id to each symbol (agent name, item name, text) of the
+    encoded messages, shared by the encoder and the decoder (see MessageCodec).
+
+    attr:
+        symbols: the symbols by id (list)
+        ids: the ids by symbol (dict)
+    """
+
+    LENGTH = struct.Struct('<I')
+
+    def __init__(self, symbols=()):
+        """ Create a new symbol table, the given symbols having the first ids.
+        """
+        self.__symbols = []
+        self.__ids = {}
+        for symbol in symbols:
+            self.get_id(symbol)
+
+    def __len__(self):
+        return len(self.__symbols)
+
+    def get_id(self, symbol):
+        """ Return the id of the symbol, a new id being given to an unknown one.
+        """
+        symbol_id = self.__ids.get(symbol)
+        if symbol_id is None:
+            symbol_id = self.__ids[symbol] = len(self.__symbols)
+            self.__symbols.append(symbol)
+        return symbol_id
+
+    def get_symbol(self, symbol_id):
+        """ Return the symbol of the given id.
+        """
+        return self.__symbols[symbol_id]
+
+    def encode(self):
+        """ Return the symbols as bytes: each one encoded in utf-8, preceded by its length.
+        """
+        chunks = []
+        for symbol in self.__symbols:
+            data = symbol.encode('utf-8')
+            chunks.append(SymbolTable.LENGTH.pack(len(data)))
+            chunks.append(data)
+        return b''.join(chunks)
+
+    @staticmethod
+    def decode(buffer):
+        """ Return the symbol table encoded in buffer (bytes-like object).
+        """
+        buffer = memoryview(buffer)
+        symbols = []
+        offset = 0
+        while offset < len(buffer):
+            (length,) = SymbolTable.LENGTH.unpack_from(buffer, offset)
+            offset += SymbolTable.LENGTH.size
+            symbols.append(str(buffer[offset:offset + length], 'utf-8'))
+            offset += length
+        return SymbolTable(symbols)
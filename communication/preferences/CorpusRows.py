@@ -0,0 +1,103 @@
+import numpy as np
+
+
+class CorpusRows:
+    """Mutable list of items selected from a shared corpus by an index array of corpus rows.
+
+    Preferences sharing a corpus (a columnar corpus, a batch item list) use it once they add or remove items:
+    removing an item only updates the row arrays, neither the corpus items nor their index are copied, so
+    that the items of a columnar corpus are not created and no item is hashed.
+
+    attr:
+        items: the shared corpus (sequence of items)
+        item_index: the item -> corpus row mapping of the corpus
+        rows: the corpus row of each position of the list (the first count ones are used)
+        positions: the position in the list of each corpus row, -1 for the rows not selected
+        count: the number of items of the list
+    """
+
+    def __init__(self, items, item_index):
+        """Creates the list of all the items of the corpus, in corpus order.
+        """
+        self.items = items
+        self.item_index = item_index
+        self.rows = np.arange(len(items), dtype=np.int64)
+        self.positions = np.arange(len(items), dtype=np.int64)
+        self.count = len(items)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, position):
+        if not 0 <= position < self.count:
+            raise IndexError('corpus rows position out of range')
+        return self.items[int(self.rows[position])]
+
+    def __setitem__(self, position, item):
+        self.rows[position] = self.item_index[item]
+
+    def __iter__(self):
+        for position in range(self.count):
+            yield self.items[int(self.rows[position])]
+
+    def covers(self, item_list):
+        """Returns True if all the items of item_list belong to the corpus.
+        """
+        return all(item in self.item_index for item in item_list)
+
+    def extend(self, item_list):
+        """Appends items of the corpus at the end of the list, their position must already be set in the index.
+        """
+        new_rows = np.array([self.item_index[item] for item in item_list], dtype=np.int64)
+        self.rows = np.concatenate((self.rows[:self.count], new_rows))
+        self.count += len(new_rows)
+
+    def pop(self):
+        """Removes the last item of the list and returns it.
+        """
+        item = self[self.count - 1]
+        self.count -= 1
+        return item
+
+    def get_missing_items(self):
+        """Returns the items of the corpus which are not in the list, in corpus order.
+        """
+        return [self.items[int(row)] for row in np.flatnonzero(self.positions < 0)]
+
+    def get_index(self):
+        """Returns the item -> position mapping of the list, read and updated through the positions array.
+        """
+        return CorpusRowIndex(self)
+
+
+class CorpusRowIndex:
+    """Item -> position mapping of CorpusRows, the corpus row being found through the corpus index."""
+
+    def __init__(self, corpus_rows):
+        self.__corpus_rows = corpus_rows
+
+    def get(self, item, default=None):
+        row = self.__corpus_rows.item_index.get(item)
+        if row is None:
+            return default
+        position = self.__corpus_rows.positions[row]
+        return default if position < 0 else int(position)
+
+    def __getitem__(self, item):
+        position = self.get(item)
+        if position is None:
+            raise KeyError(item)
+        return position
+
+    def __setitem__(self, item, position):
+        self.__corpus_rows.positions[self.__corpus_rows.item_index[item]] = position
+
+    def __delitem__(self, item):
+        self.__getitem__(item)
+        self.__corpus_rows.positions[self.__corpus_rows.item_index[item]] = -1
+
+    def __contains__(self, item):
+        return self.get(item) is not None
+
+    def __len__(self):
+        return len(self.__corpus_rows)
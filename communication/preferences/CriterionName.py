@@ -3,7 +3,40 @@
 from enum import Enum
 
 
-class CriterionName(Enum):
+class Criterion(Enum):
+    """Criterion enum base class.
+    Base of the criterion enumerations: each member is created from its (column, name), the column being its
+    position in the criterion set. New criterion sets can be defined at runtime with Criterion.create.
+    """
+
+    def __new__(cls, value, name):
+        member = object.__new__(cls)
+        member._value_ = value
+        member.fullname = name
+        return member
+
+    @classmethod
+    def create(cls, set_name, criterion_names):
+        """Returns a new criterion enumeration named set_name with one member per criterion name.
+
+        The enumeration is registered in this module under set_name, so that its members can be pickled
+        (archived messages, messages between processes). Creating a set again with the same criterion names
+        returns the registered one; another process has to create the set too before unpickling its members.
+        """
+        criterion_names = list(criterion_names)
+        registered = globals().get(set_name)
+        if registered is not None:
+            if isinstance(registered, type) and issubclass(registered, cls) and \
+                    [criterion.name for criterion in registered] == criterion_names:
+                return registered
+            raise ValueError("{} is already defined in {} with other criteria".format(set_name, __name__))
+        criteria = cls(set_name, [(name, (column, name)) for column, name in enumerate(criterion_names)],
+                       module=__name__, qualname=set_name)
+        globals()[set_name] = criteria
+        return criteria
+
+
+class CriterionName(Criterion):
     """CriterionName enum class.
     Enumeration containing the possible CriterionName.
     """
@@ -13,12 +46,6 @@ class CriterionName(Enum):
     ENVIRONMENT_IMPACT = 3, 'ENVIRONMENT_IMPACT'
     NOISE = 4, 'NOISE'
     COST_PER_KM = 5, 'COST_PER_KM'
-    
-    def __new__(cls, value, name):
-        member = object.__new__(cls)
-        member._value_ = value
-        member.fullname = name
-        return member
 
 
 criterionName_classdict = {
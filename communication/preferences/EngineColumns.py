@@ -0,0 +1,156 @@
+import numpy as np
+
+from communication.preferences.CriterionName import CriterionName
+from communication.preferences.EngineView import EngineView
+
+
+class EngineColumns:
+    """Columnar (struct of arrays) list of engines.
+
+    Each criterion attribute is stored as a contiguous column of an (engines x criteria) float array, columns
+    following the CriterionName order. It behaves as a read-only sequence of items: the EngineView of a row is
+    only created when it is accessed, then cached so that the same row always gives the same item.
+
+    attr:
+        engine_types: the list of (engine class, name prefix, quality factors) blocks, in row order
+        attributes: the (engines x criteria) array of criterion values
+    """
+
+    def __init__(self, engine_types):
+        """Creates the columns of engine_types, a list of (engine class, name prefix, quality factors array).
+
+        The engine class only provides the vectorized criterion_values and the DESCRIPTION of its type.
+        """
+        self.engine_types = engine_types
+        self.__block_starts = np.cumsum([0] + [len(quality_factors) for _, _, quality_factors in engine_types])
+        self.__criterion_columns = {criterion.name: criterion.value for criterion in CriterionName}
+        blocks = []
+        for engine_class, _, quality_factors in engine_types:
+            criterion_values = engine_class.criterion_values(quality_factors)
+            block = np.empty((len(quality_factors), len(CriterionName)))
+            for criterion in CriterionName:
+                block[:, criterion.value] = criterion_values[criterion.name]
+            blocks.append(block)
+        self.attributes = np.concatenate(blocks) if blocks else np.zeros((0, len(CriterionName)))
+        self.__views = {}
+
+    def __len__(self):
+        return len(self.attributes)
+
+    def __getitem__(self, row):
+        """Returns the item of a row (or the list of items of a slice), created on first access.
+        """
+        if isinstance(row, slice):
+            return [self[index] for index in range(*row.indices(len(self)))]
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError('engine row out of range')
+        view = self.__views.get(row)
+        if view is None:
+            view = self.__views[row] = EngineView(self, row)
+        return view
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield self[row]
+
+    def __locate(self, row):
+        """Returns the engine type block of a row and the position of the row in this block."""
+        block = int(np.searchsorted(self.__block_starts, row, side='right')) - 1
+        return self.engine_types[block], row - int(self.__block_starts[block])
+
+    def find_row(self, name):
+        """Returns the row of the engine with the given name, None if there is none.
+        """
+        prefix, _, number = name.rpartition(' ')
+        for block, (_, block_prefix, quality_factors) in enumerate(self.engine_types):
+            if block_prefix == prefix and number.isdigit() and 0 < int(number) <= len(quality_factors):
+                return int(self.__block_starts[block]) + int(number) - 1
+        return None
+
+    def get_name(self, row):
+        """Returns the name of the engine of a row.
+        """
+        (_, prefix, _), position = self.__locate(row)
+        return '{} {}'.format(prefix, position + 1)
+
+    def get_description(self, row):
+        """Returns the description of the engine of a row.
+        """
+        (engine_class, _, quality_factors), position = self.__locate(row)
+        return engine_class.DESCRIPTION.format(float(quality_factors[position]))
+
+    def get_criterion_value(self, row, criterion):
+        """Returns the value of a criterion for the engine of a row.
+        """
+        try:
+            return float(self.attributes[row, self.__criterion_columns[criterion]])
+        except KeyError:
+            raise AttributeError(criterion) from None
+
+    def get_attributes(self, criteria=CriterionName):
+        """Returns the (engines x criteria) array of criterion values, one column per criterion of criteria.
+        """
+        if criteria is CriterionName:
+            return self.attributes
+        return self.attributes[:, [self.__criterion_columns[criterion.name] for criterion in criteria]]
+
+    def get_row_index(self):
+        """Returns a read-only item -> row mapping which does not need the items to be created.
+        """
+        return EngineRowIndex(self)
+
+    def get_name_index(self):
+        """Returns a read-only name -> item mapping which parses the names instead of storing them.
+        """
+        return EngineNameIndex(self)
+
+
+class EngineRowIndex:
+    """Item -> row mapping of EngineColumns, the row being read from the EngineView itself."""
+
+    def __init__(self, columns):
+        self.__columns = columns
+
+    def get(self, item, default=None):
+        if isinstance(item, EngineView) and item.columns is self.__columns:
+            return item.row
+        return default
+
+    def __getitem__(self, item):
+        row = self.get(item)
+        if row is None:
+            raise KeyError(item)
+        return row
+
+    def __contains__(self, item):
+        return self.get(item) is not None
+
+    def __len__(self):
+        return len(self.__columns)
+
+
+class EngineNameIndex:
+    """Name -> item mapping of EngineColumns, the row being parsed from the engine name."""
+
+    def __init__(self, columns):
+        self.__columns = columns
+
+    def get(self, name, default=None):
+        row = self.__columns.find_row(name)
+        if row is None:
+            return default
+        return self.__columns[row]
+
+    def __getitem__(self, name):
+        item = self.get(name)
+        if item is None:
+            raise KeyError(name)
+        return item
+
+    def __contains__(self, name):
+        return self.__columns.find_row(name) is not None
+
+    def __len__(self):
+        return len(self.__columns)
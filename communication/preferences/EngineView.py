@@ -0,0 +1,33 @@
+from communication.preferences.Item import Item
+
+
+class EngineView(Item):
+    """Thin item standing for one row of a columnar engines corpus.
+
+    Criterion attributes are read from the corpus columns instead of being stored on the object.
+
+    attr:
+        columns: the EngineColumns the engine belongs to
+        row: the row of the engine in the columns
+    """
+
+    __slots__ = ('columns', 'row')
+
+    def __init__(self, columns, row):
+        """Creates a new EngineView.
+        """
+        super().__init__(columns.get_name(row), None)
+        self.columns = columns
+        self.row = row
+
+    def __getattr__(self, criterion):
+        """Returns the value of a criterion attribute, read from the corpus columns.
+        """
+        if criterion.startswith('__') or criterion in ('columns', 'row'):
+            raise AttributeError(criterion)
+        return self.columns.get_criterion_value(self.row, criterion)
+
+    def get_description(self):
+        """Returns the description of the engine, built on demand.
+        """
+        return self.columns.get_description(self.row)
@@ -1,18 +1,25 @@
+import numpy as np
+
 from communication.preferences.DieselEngine import DieselEngine
 from communication.preferences.ElectricEngine import ElectricEngine
+from communication.preferences.EngineColumns import EngineColumns
 
 
 class EnginesCorpus:
     """Create a corpus of engines that will be reviewed by the different agents in the argumentation.
     
     The corpus size will be a multiple of 10 to easily check the 10 best percent engines for a reviewer.
+    
+    In columnar mode, no engine object is built up front: the criterion values are computed for all the engines
+    at once and stored as arrays (see EngineColumns), items are only created when they are accessed.
     """
     
-    def __init__(self, corpus_size):
+    def __init__(self, corpus_size, columnar=False):
         """Instantiate the engines corpus.
 
         Args:
             corpus_size (int): integer indicating the size of the corpus. It should be a multiple of 10.
+            columnar (bool): store the engines as columns of criterion values instead of engine objects.
         """
         
         # Input validation to check argument is a multiple of 10.
@@ -23,6 +30,18 @@ class EnginesCorpus:
         
         nb_iter = _corpus_size // 2
         pad_size = 1 / (nb_iter - 1)
+        
+        if columnar:
+            quality_factors = pad_size * np.arange(nb_iter) # quality_factor between 0 and 1 to define the engines
+            self.columns = EngineColumns([
+                (ElectricEngine, 'Electric Engine', quality_factors),
+                (DieselEngine, 'Diesel Engine', quality_factors),
+            ])
+            self.__electrics = None
+            self.__diesels = None
+            self.__name_index = self.columns.get_name_index()
+            return
+        
         unique_id = 1
         
         electrics = []
@@ -39,8 +58,32 @@ class EnginesCorpus:
             diesels.append(diesel)
             unique_id += 1
         
-        self.electrics = electrics
-        self.diesels = diesels
+        self.columns = None
+        self.__electrics = electrics
+        self.__diesels = diesels
+        self.__name_index = None
+    
+    @property
+    def electrics(self):
+        """The electric engines (created on access in columnar mode)."""
+        if self.__electrics is None:
+            return self.columns[:len(self.columns) // 2]
+        return self.__electrics
+    
+    @property
+    def diesels(self):
+        """The diesel engines (created on access in columnar mode)."""
+        if self.__diesels is None:
+            return self.columns[len(self.columns) // 2:]
+        return self.__diesels
+    
+    def get_name_index(self):
+        """Returns the name -> engine index of the corpus, built once and meant to be shared by all the agents."""
+        if self.__name_index is None:
+            self.__name_index = {engine.get_name(): engine for engine in self.generate_engines_list()}
+        return self.__name_index
     
     def generate_engines_list(self):
+        if self.columns is not None:
+            return self.columns
         return self.electrics + self.diesels
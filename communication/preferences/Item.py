@@ -10,6 +10,8 @@ class Item:
         description: the description of the item
      """
 
+    __slots__ = ('__name', '__description')
+
     def __init__(self, name, description):
         """Creates a new Item.
         """
@@ -19,7 +21,7 @@ class Item:
     def __str__(self):
         """Returns Item as a String.
         """
-        return self.__name + " (" + self.__description + ")"
+        return self.get_name() + " (" + self.get_description() + ")"
 
     def get_name(self):
         """Returns the name of the item.
@@ -39,9 +41,4 @@ class Item:
     def get_score(self, preferences):
         """Returns the score of the Item according to agent preferences.
         """
-        criterion_weight = 100
-        sum_result = 0
-        for criterion_name in preferences.get_criterion_name_list():
-            sum_result = sum_result + criterion_weight * self.get_value(preferences, criterion_name).value
-            criterion_weight = criterion_weight / 2
-        return sum_result
+        return preferences.get_score(self)
@@ -1,10 +1,32 @@
 #!/usr/bin/env python3
 import random as rd
+from bisect import bisect_left
+from collections import OrderedDict
 
+import numpy as np
+
+from communication.preferences.CorpusRows import CorpusRows
 from communication.preferences.CriterionName import CriterionName
 from communication.preferences.CriterionValue import CriterionValue
 from communication.preferences.Value import Value
 
+# Values indexed by their integer code, used to decode the evaluation matrix.
+VALUES = tuple(Value)
+
+# (low, high, divisor) of the random thresholds VERY_BAD/BAD, BAD/GOOD and GOOD/VERY_GOOD of each criterion:
+# a threshold is randrange(low, high) / divisor.
+CRITERION_THRESHOLD_RANGES = {
+    'PRODUCTION_COST': [(17000, 19000, 1), (14000, 16000, 1), (11000, 13000, 1)],
+    'CONSUMPTION': [(60, 80, 10), (30, 50, 10), (1, 20, 10)],
+    'DURABILITY': [(-20, -16, 10), (-27, -23, 10), (-34, -30, 10)], # ce critère est négatif
+    'ENVIRONMENT_IMPACT': [(30, 34, 10), (23, 27, 10), (16, 20, 10)],
+    'NOISE': [(68, 72, 1), (58, 62, 1), (48, 52, 1)],
+    'COST_PER_KM': [(80, 100, 1000), (50, 60, 1000), (20, 30, 1000)],
+}
+
+# Maximum number of results kept by Preferences.get_memoized.
+MEMO_SIZE = 1024
+
 
 class Preferences:
     """Preferences class.
@@ -12,7 +34,10 @@ class Preferences:
 
     attr:
         criterion_name_list: the list of criterion name (ordered by importance)
-        criterion_value_list: the list of criterion value
+        criterion_value_list: the list of criterion value (materialized on demand from the evaluation matrix)
+        criteria: the criterion enumeration (CriterionName by default, see Criterion.create for other ones)
+        evaluation_matrix: the (items x criteria) matrix of Value codes, one column per criterion (its value)
+        item_ordered_list: the items ordered by decreasing score (built on demand, then kept sorted incrementally)
     """
     # à supprimer après
     # criterion_category_range = {
@@ -23,170 +48,575 @@ class Preferences:
     #     'NOISE': [(68,72), (58,62), (48,52)],
     #     'COST_PER_KM': [(0.1, 0.08), (0.06,0.05), (0.02,0.03)],
     # }
+    
+    # increased on every change of the items, their evaluations or the criterion order
+    __version = 0
+    __memo = None
+    __memo_version = None
 
-    def __init__(self, item_list=None):
+    def __init__(self, item_list=None, name_index=None, criteria=CriterionName, threshold_ranges=None, rng=None):
         """Creates a new Preferences object.
         Pass an item_list parameter which contains the Engine corpus that will be discussed by the agents.
+        Pass the name -> item index of the corpus (see EnginesCorpus.get_name_index) to share it between agents,
+        otherwise it is built from the item list when a name is first looked up.
+        Pass criteria and their threshold_ranges (same layout as CRITERION_THRESHOLD_RANGES) to use
+        other criteria than the engine ones, the items then need one attribute per criterion name.
+        Pass a random.Random as rng to draw the criterion order and the thresholds from it instead of the
+        random module.
         """
         
         self.__item_list = item_list
-        self.__item_scores = []
-        self.__item_ordered_list = []
-        
-        criterion_name_list = [
-            CriterionName.PRODUCTION_COST, 
-            CriterionName.CONSUMPTION,
-            CriterionName.DURABILITY,
-            CriterionName.ENVIRONMENT_IMPACT,
-            CriterionName.NOISE,
-            CriterionName.COST_PER_KM
-        ]
-        rd.shuffle(criterion_name_list)
-        self.__criterion_name_list = criterion_name_list
+        self.__name_index = name_index
+        
+        rng = rd if rng is None else rng
+        criterion_name_list = list(criteria)
+        rng.shuffle(criterion_name_list)
         
         # expliquer comment on définit nos ranges
-        self.__criterion_category = {
-            'PRODUCTION_COST': [rd.randrange(17000,19000), rd.randrange(14000,16000), rd.randrange(11000,13000)],
-            'CONSUMPTION': [rd.randrange(60,80)/10, rd.randrange(30,50)/10, rd.randrange(1,20)/10],
-            'DURABILITY': [rd.randrange(-20,-16)/10, rd.randrange(-27,-23)/10, rd.randrange(-34,-30)/10], # ce critère est négatif 
-            'ENVIRONMENT_IMPACT': [rd.randrange(30,34)/10, rd.randrange(23, 27)/10, rd.randrange(16, 20)/10],
-            'NOISE': [rd.randrange(68,72), rd.randrange(58,62), rd.randrange(48,52)],
-            'COST_PER_KM': [rd.randrange(80, 100)/1000, rd.randrange(50,60)/1000, rd.randrange(20,30)/1000],
+        threshold_ranges = CRITERION_THRESHOLD_RANGES if threshold_ranges is None else threshold_ranges
+        criterion_category = {
+            criterion.name: [rng.randrange(low, high) / divisor for low, high, divisor in threshold_ranges[criterion.name]]
+            for criterion in criteria
         }
         
-        self.__criterion_value_list = self.evaluate_items(item_list) if item_list else [] # ordre pas important
-        self.__item_scores = [item.get_score(self) for item in self.__item_list]
-        sorted_score_index = sorted(zip(self.__item_scores,range(len(self.__item_list))), reverse=True)
-        self.__item_ordered_list = [self.__item_list[index] for _,index in sorted_score_index]
+        self.__set_criteria(criteria, criterion_name_list, criterion_category)
+        self.__set_item_list(item_list)
+    
+    @classmethod
+    def generate_batch(cls, item_list, agent_count, rng=None, name_index=None, criteria=CriterionName, threshold_ranges=None,
+                       agent_indices=None):
+        """Creates the preferences of agent_count agents over the same item list at once.
+        
+        Criterion orders and thresholds of all the agents are drawn as arrays and the whole
+        (agents x items x criteria) evaluation tensor is classified by broadcasting. Each returned
+        Preferences evaluates the items through its own slice of the tensor and shares the item list
+        with the others until it is modified.
+        
+        rng: a numpy Generator or a seed, passed to np.random.default_rng
+        name_index: the name -> item index of the corpus, built once for the whole batch if not given
+        criteria, threshold_ranges: as in the constructor
+        agent_indices: the indices of the agents whose preferences are returned (all of them by default), e.g. the
+            agents of one worker process: the criterion orders and thresholds of all the agent_count agents are
+            still drawn, so that an agent gets the same preferences whatever the agents selected, but only the
+            selected ones are classified
+        """
+        rng = np.random.default_rng(rng)
+        criterion_set = criteria
+        criteria = list(criteria)
+        threshold_ranges = CRITERION_THRESHOLD_RANGES if threshold_ranges is None else threshold_ranges
+        low, high, divisor = np.array(
+            [threshold_ranges[criterion.name] for criterion in criteria], dtype=float
+        ).transpose(2, 0, 1)
+        thresholds = rng.integers(low, high, size=(agent_count, len(criteria), 3)) / divisor
+        criterion_orders = np.argsort(rng.random((agent_count, len(criteria))), axis=1)
+        if agent_indices is not None:
+            thresholds = thresholds[list(agent_indices)]
+            criterion_orders = criterion_orders[list(agent_indices)]
+        
+        attributes = cls.get_item_attributes(item_list, criterion_set)
+        evaluations = np.full((len(thresholds), len(item_list), len(criteria)), Value.VERY_GOOD.value, dtype=np.int8)
+        for level in range(thresholds.shape[2]):
+            evaluations -= attributes[np.newaxis, :, :] > thresholds[:, np.newaxis, :, level]
+        
+        if hasattr(item_list, 'get_row_index'):
+            item_index = item_list.get_row_index()
+        else:
+            item_list = list(item_list)
+            item_index = {item: row for row, item in enumerate(item_list)}
+        if name_index is None:
+            name_index = cls.build_name_index(item_list)
+        batch = []
+        for agent in range(len(thresholds)):
+            preferences = cls.__new__(cls)
+            preferences.__name_index = name_index
+            preferences.__set_criteria(
+                criterion_set,
+                [criteria[column] for column in criterion_orders[agent]],
+                {criterion.name: thresholds[agent, column].tolist() for column, criterion in enumerate(criteria)},
+            )
+            preferences.__set_item_list(None)
+            preferences.__share_items(item_list, item_index, evaluations[agent])
+            batch.append(preferences)
+        return batch
+    
+    def __set_criteria(self, criteria, criterion_name_list, criterion_category):
+        """Store the criteria, their order and the thresholds of each criterion."""
+        self.__criteria = criteria
+        self.set_criterion_name_list(criterion_name_list)
+        self.__criterion_category = criterion_category
+        # thresholds as a (criteria x 3) array, one row per criterion column
+        self.__criterion_columns = {criterion.name: criterion.value for criterion in criteria}
+        self.__criterion_thresholds = np.array([self.__criterion_category[criterion.name] for criterion in criteria])
+        
+    def __set_item_list(self, item_list):
+        """Reset the item list and (re)build the evaluation matrix and the item row index."""
+        self.__item_list = []
+        self.__item_index = {}
+        self.__item_sequences = np.zeros(0, dtype=np.int64) # insertion order of each row, used to break ties
+        self.__next_sequence = 0
+        self.__evaluation_matrix = np.zeros((0, len(self.__criteria)), dtype=np.int8)
+        self.__shared_items = False
+        self.__added_names = {} # items added on top of a shared name index
+        self.__dirty_rows = set()
+        self.__criterion_value_list = None # materialized lazily by get_criterion_value_list
+        self.__invalidate_scores()
+        if hasattr(item_list, 'get_row_index'):
+            self.__share_items(item_list, item_list.get_row_index(), self.evaluate_items(item_list))
+        elif item_list:
+            self.add_items(item_list)
+    
+    def __share_items(self, item_list, item_index, evaluation_matrix):
+        """Use an item list and a row index shared with others (a batch, a columnar corpus) until they are modified."""
+        self.__item_list = item_list
+        self.__item_index = item_index
+        self.__item_sequences = np.arange(len(item_list), dtype=np.int64)
+        self.__next_sequence = len(item_list)
+        self.__evaluation_matrix = evaluation_matrix
+        self.__shared_items = True
+    
+    def __invalidate_scores(self):
+        """Drop the scores and everything derived from them, they will be recomputed on demand."""
+        self.__item_scores = None
+        self.__ranking_keys = None
+        self.__item_ordered_list = None
+        self.__item_ranks = None
+        self.__invalidate_top()
+    
+    def __invalidate_top(self):
+        """Drop the cached most preferred item and top items, and any memoized result."""
+        self.__top_items = None
+        self.__best_row = None
+        self.__version += 1
+    
+    def __ranking_key(self, row):
+        """Sort key of a row in the ordered list: decreasing score, then decreasing insertion order."""
+        return (-float(self.__item_scores[row]), -int(self.__item_sequences[row]))
+    
+    def __insert_ranking(self, rows):
+        """Insert rows in the ordered list, if it has already been built."""
+        if self.__ranking_keys is None:
+            return
+        for row in rows:
+            key = self.__ranking_key(row)
+            position = bisect_left(self.__ranking_keys, key)
+            self.__ranking_keys.insert(position, key)
+            self.__item_ordered_list.insert(position, self.__item_list[row])
+        self.__item_ranks = None
+    
+    def __delete_ranking(self, rows):
+        """Delete rows from the ordered list, if it has already been built."""
+        if self.__ranking_keys is None:
+            return
+        for row in rows:
+            position = bisect_left(self.__ranking_keys, self.__ranking_key(row))
+            del self.__ranking_keys[position]
+            del self.__item_ordered_list[position]
+        self.__item_ranks = None
+    
+    def __rescore_rows(self, rows):
+        """Recompute the scores of the given rows and move them in the ordered list.
+        
+        The rows must have already been deleted from the ordered list.
+        """
+        if self.__item_scores is not None:
+            self.__item_scores[rows] = self.__evaluation_matrix[rows] @ self.__criterion_weights
+            self.__insert_ranking(rows)
+        self.__invalidate_top()
+    
+    def __refresh(self):
+        """Re-evaluate the rows of the items marked as updated since the last query."""
+        if not self.__dirty_rows:
+            return
+        rows = sorted(self.__dirty_rows)
+        self.__dirty_rows.clear()
+        self.__delete_ranking(rows)
+        self.__evaluation_matrix[rows] = self.evaluate_items([self.__item_list[row] for row in rows])
+        self.__criterion_value_list = None
+        self.__rescore_rows(rows)
+    
+    def __sync_item_list(self, item_list):
+        """Bring the item list in line with the given one, only the added and removed items are processed.
+        
+        Items kept from the current list keep their position in the ranking ties. When the given list is the
+        shared corpus the current items are selected from, only the corpus rows missing from the list are added.
+        """
+        if item_list is self.__item_list:
+            return
+        if isinstance(self.__item_list, CorpusRows) and item_list is self.__item_list.items:
+            self.add_items(self.__item_list.get_missing_items())
+            return
+        kept_items = set(item_list)
+        self.remove_items([item for item in self.__item_list if item not in kept_items])
+        self.add_items(item_list)
+    
+    def __own_items(self, new_items=()):
+        """Select the items from the corpus shared with other preferences (a batch, a columnar corpus) by
+        corpus rows before modifying the list, the items and their index staying shared.
+        
+        The list is only copied if items which are not in the corpus are added.
+        """
+        if self.__shared_items:
+            self.__item_list = CorpusRows(self.__item_list, self.__item_index)
+            self.__item_index = self.__item_list.get_index()
+            self.__item_sequences = self.__item_sequences.copy()
+            self.__shared_items = False
+        if isinstance(self.__item_list, CorpusRows) and not self.__item_list.covers(new_items):
+            self.__item_list = list(self.__item_list)
+            self.__item_index = {item: row for row, item in enumerate(self.__item_list)}
+    
+    def add_item(self, item):
+        """Adds an item to the list and evaluates it.
+        """
+        self.add_items([item])
+    
+    def add_items(self, item_list):
+        """Adds several items to the list, only these items are evaluated. Items already in the list are ignored.
+        """
+        new_items = [item for item in dict.fromkeys(item_list) if item not in self.__item_index]
+        if not new_items:
+            return
+        self.__own_items(new_items)
+        first_row = len(self.__item_list)
+        for row, item in enumerate(new_items, first_row):
+            self.__item_index[item] = row
+        self.__item_list.extend(new_items)
+        if self.__name_index is not None:
+            for item in new_items:
+                if self.__name_index.get(item.get_name()) is not item:
+                    self.__added_names[item.get_name()] = item
+        sequences = np.arange(self.__next_sequence, self.__next_sequence + len(new_items), dtype=np.int64)
+        self.__next_sequence += len(new_items)
+        self.__item_sequences = np.concatenate((self.__item_sequences, sequences))
+        self.__evaluation_matrix = np.concatenate((self.__evaluation_matrix, self.evaluate_items(new_items)))
+        self.__criterion_value_list = None
+        if self.__item_scores is not None:
+            new_scores = self.__evaluation_matrix[first_row:] @ self.__criterion_weights
+            self.__item_scores = np.concatenate((self.__item_scores, new_scores))
+        self.__insert_ranking(range(first_row, len(self.__item_list)))
+        self.__invalidate_top()
+    
+    def remove_item(self, item):
+        """Removes an item from the list.
+        """
+        self.remove_items([item])
+    
+    def remove_items(self, item_list):
+        """Removes several items from the list. Items which are not in the list are ignored.
+        
+        Each removed row is replaced by the last one, so that no other row has to be moved or re-evaluated.
+        """
+        self.__refresh()
+        rows = sorted({self.__item_index[item] for item in item_list if item in self.__item_index}, reverse=True)
+        if not rows:
+            return
+        self.__own_items()
+        self.__delete_ranking(rows)
+        for row in rows:
+            last_row = len(self.__item_list) - 1
+            del self.__item_index[self.__item_list[row]]
+            if row != last_row:
+                moved_item = self.__item_list[last_row]
+                self.__item_list[row] = moved_item
+                self.__item_index[moved_item] = row
+                self.__item_sequences[row] = self.__item_sequences[last_row]
+                self.__evaluation_matrix[row] = self.__evaluation_matrix[last_row]
+                if self.__item_scores is not None:
+                    self.__item_scores[row] = self.__item_scores[last_row]
+            self.__item_list.pop()
+        item_count = len(self.__item_list)
+        self.__item_sequences = self.__item_sequences[:item_count]
+        self.__evaluation_matrix = self.__evaluation_matrix[:item_count]
+        if self.__item_scores is not None:
+            self.__item_scores = self.__item_scores[:item_count]
+        self.__criterion_value_list = None
+        self.__invalidate_top()
+    
+    @staticmethod
+    def build_name_index(item_list):
+        """Returns a name -> item index of an item list. Columnar item lists (see EngineColumns) give their own.
+        """
+        if hasattr(item_list, 'get_name_index'):
+            return item_list.get_name_index()
+        return {item.get_name(): item for item in item_list}
+    
+    def get_item_from_name(self, item_name):
+        """Returns the item of the list with the given name, None if there is none.
+        """
+        if self.__name_index is None:
+            self.__name_index = self.build_name_index(self.__item_list)
+        item = self.__added_names.get(item_name)
+        if item is None:
+            item = self.__name_index.get(item_name)
+        if item is None or item not in self.__item_index:
+            return None
+        return item
+    
+    def update_item(self, item):
+        """Marks an item whose attributes changed, it will be re-evaluated before the next query.
+        """
+        self.update_items([item])
+    
+    def update_items(self, item_list):
+        """Marks several items whose attributes changed, they will be re-evaluated before the next query.
+        """
+        self.__dirty_rows.update(self.__item_index[item] for item in item_list)
+    
+    def classify(self, attributes):
+        """Turn an (items x criteria) array of raw attributes into Value codes.
+        
+        An attribute above the first threshold of its criterion is VERY_BAD, above the second one BAD,
+        above the third one GOOD and VERY_GOOD otherwise: the code is 3 minus the number of thresholds exceeded.
+        """
+        exceeded = (attributes[:, :, np.newaxis] > self.__criterion_thresholds[np.newaxis, :, :]).sum(axis=2)
+        return (Value.VERY_GOOD.value - exceeded).astype(np.int8)
+    
+    @staticmethod
+    def get_item_attributes(item_list, criteria=CriterionName):
+        """Returns the (items x criteria) array of the raw attributes of the items, one column per criterion.
         
+        Columnar item lists (see EngineColumns) give their attribute array directly.
+        """
+        if hasattr(item_list, 'get_attributes'):
+            return item_list.get_attributes(criteria)
+        return np.array(
+            [[getattr(item, criterion.name) for criterion in criteria] for item in item_list],
+            dtype=float,
+        ).reshape(len(item_list), len(criteria))
     
     def evaluate_items(self, item_list):
-        """Evaluate each item of the list"""
-        criterion_value_list = []        
-        for item in item_list:
-            evaluation = self.evaluate_item(item)
-            for criterion, value in evaluation.items():
-                criterion_value_list.append(CriterionValue(item, criterion, value))
-        # for criterion_value in criterion_value_list:
-        #     self.add_criterion_value(criterion_value)
-        return criterion_value_list
+        """Evaluate each item of the list.
+        
+        Returns the (items x criteria) evaluation matrix of Value codes.
+        """
+        return self.classify(self.get_item_attributes(item_list, self.__criteria))
     
     def evaluate_item(self, item):
         """Attribute a category for each criterion given the preferences of the agent to the item.
         """
+        [codes] = self.evaluate_items([item])
+        return {criterion.name: VALUES[code] for criterion, code in zip(self.__criteria, codes)}
+
+    def get_version(self):
+        """Returns a counter which changes whenever the items, their evaluations or the criterion order change.
+        """
+        if self.__dirty_rows:
+            self.__refresh()
+        return self.__version
+
+    def get_memoized(self, key, compute):
+        """Returns compute(), memoized under key until the preferences change.
         
-        dict_item = vars(item)
-        evaluation = {
-            'PRODUCTION_COST': 0,
-            'CONSUMPTION': 0,
-            'DURABILITY': 0,
-            'ENVIRONMENT_IMPACT': 0,
-            'NOISE': 0,
-            'COST_PER_KM': 0,
-        }
-        for criterion in self.__criterion_name_list:
-            if dict_item[criterion.name] > self.__criterion_category[criterion.name][0]:
-                evaluation[criterion.name] = Value.VERY_BAD
-            elif dict_item[criterion.name] > self.__criterion_category[criterion.name][1]:
-                evaluation[criterion.name] = Value.BAD
-            elif dict_item[criterion.name] > self.__criterion_category[criterion.name][2]:
-                evaluation[criterion.name] = Value.GOOD
-            else:
-                evaluation[criterion.name] = Value.VERY_GOOD
-        
-        return evaluation        
+        At most MEMO_SIZE results are kept, the least recently used one is evicted first.
+        """
+        version = self.get_version()
+        if self.__memo is None or self.__memo_version != version:
+            self.__memo = OrderedDict()
+            self.__memo_version = version
+        if key in self.__memo:
+            self.__memo.move_to_end(key)
+            return self.__memo[key]
+        result = self.__memo[key] = compute()
+        if len(self.__memo) > MEMO_SIZE:
+            self.__memo.popitem(last=False)
+        return result
+
+    def get_criteria(self):
+        """Returns the criterion enumeration.
+        """
+        return self.__criteria
 
     def get_criterion_name_list(self):
         """Returns the list of criterion name.
         """
         return self.__criterion_name_list
 
+    def get_criterion_category(self):
+        """Returns the thresholds VERY_BAD/BAD, BAD/GOOD and GOOD/VERY_GOOD of each criterion, by criterion name.
+        """
+        return self.__criterion_category
+
+    def get_criterion_rank(self, criterion_name):
+        """Returns the rank of a criterion in the list of criterion name (0 for the most important one).
+        """
+        return self.__criterion_ranks[criterion_name]
+
     def get_criterion_value_list(self):
         """Returns the list of criterion value.
         """
+        self.__refresh()
+        if self.__criterion_value_list is None:
+            self.__criterion_value_list = [
+                CriterionValue(item, criterion.name, VALUES[code])
+                for item, codes in zip(self.__item_list, self.__evaluation_matrix)
+                for criterion, code in zip(self.__criteria, codes)
+            ]
         return self.__criterion_value_list
 
+    def get_evaluation_matrix(self):
+        """Returns the (items x criteria) matrix of Value codes.
+        """
+        self.__refresh()
+        return self.__evaluation_matrix
+
     def set_criterion_name_list(self, criterion_name_list):
         """Sets the list of criterion name.
+        
+        The weight of a criterion is 100 for the most important one and is halved at each following rank.
         """
         self.__criterion_name_list = criterion_name_list
+        self.__criterion_ranks = {criterion_name: rank for rank, criterion_name in enumerate(criterion_name_list)}
+        self.__criterion_weights = np.zeros(len(self.__criteria))
+        for rank, criterion_name in enumerate(criterion_name_list):
+            self.__criterion_weights[criterion_name.value] = 100 / 2 ** rank
+        self.__invalidate_scores()
 
     def add_criterion_value(self, criterion_value):
         """Adds a criterion value in the list.
         """
-        self.__criterion_value_list.append(criterion_value)
+        self.get_criterion_value_list().append(criterion_value)
+        row = self.__item_index.get(criterion_value.get_item())
+        if row is not None:
+            criterion_name = criterion_value.get_criterion_name()
+            column = self.__criterion_columns[getattr(criterion_name, 'name', criterion_name)]
+            self.__delete_ranking([row])
+            self.__evaluation_matrix[row, column] = criterion_value.get_value().value
+            self.__rescore_rows([row])
 
     def get_value(self, item, criterion_name):
         """Gets the value for a given item and a given criterion name.
         """
-        for value in self.__criterion_value_list:
-            if value.get_item() == item and value.get_criterion_name() == criterion_name.name:
-                return value.get_value()
-        return None
+        if self.__dirty_rows:
+            self.__refresh()
+        row = self.__item_index.get(item)
+        if row is None:
+            return None
+        return VALUES[self.__evaluation_matrix[row, self.__criterion_columns[criterion_name.name]]]
 
     def is_preferred_criterion(self, criterion_name_1, criterion_name_2):
         """Returns if a criterion 1 is preferred to the criterion 2.
         """
-        for criterion_name in self.__criterion_name_list:
-            if criterion_name == criterion_name_1:
-                return True
-            if criterion_name == criterion_name_2:
-                return False
+        rank_1 = self.__criterion_ranks.get(criterion_name_1)
+        rank_2 = self.__criterion_ranks.get(criterion_name_2)
+        if rank_1 is None and rank_2 is None:
+            return None
+        return rank_2 is None or (rank_1 is not None and rank_1 <= rank_2)
 
     def is_preferred_item(self, item_1, item_2):
         """Returns if the item 1 is preferred to the item 2.
         """
         return item_1.get_score(self) > item_2.get_score(self)
 
+    def get_item_scores(self):
+        """Returns the scores of all the items of the list, computed in one weighted matrix-vector product.
+        """
+        self.__refresh()
+        if self.__item_scores is None:
+            self.__item_scores = self.__evaluation_matrix @ self.__criterion_weights
+        return self.__item_scores
+
+    def get_score(self, item):
+        """Returns the score of a given item.
+        """
+        return float(self.get_item_scores()[self.__item_index[item]])
+
+    def get_item_ordered_list(self):
+        """Returns the items ordered from the most to the least preferred one.
+        
+        Equal scores are ranked by decreasing insertion order. The list is fully sorted the first time it
+        is needed, then kept sorted when items are added, removed or updated.
+        """
+        scores = self.get_item_scores()
+        if self.__item_ordered_list is None:
+            order = np.lexsort((-self.__item_sequences, -scores))
+            self.__ranking_keys = list(zip((-scores[order]).tolist(), (-self.__item_sequences[order]).tolist()))
+            self.__item_ordered_list = [self.__item_list[row] for row in order]
+        return self.__item_ordered_list
+
+    def rank_of(self, item):
+        """Returns the rank of an item in the ordered list (0 for the most preferred item).
+        
+        The item -> rank map is rebuilt from the ordered list after it changed, then each lookup is O(1).
+        """
+        item_ordered_list = self.get_item_ordered_list()
+        if self.__item_ranks is None:
+            self.__item_ranks = dict(zip(item_ordered_list, range(len(item_ordered_list))))
+        return self.__item_ranks[item]
+
+    def items_above(self, item):
+        """Returns the items preferred to the given one, from the most preferred one.
+        """
+        return self.get_item_ordered_list()[:self.rank_of(item)]
+
+    def __select_top_rows(self, top_count):
+        """Returns a boolean mask of the top_count best ranked rows.
+        
+        Uses a partial selection around the top_count-th best score instead of sorting all the items,
+        ties on that score are resolved as in get_item_ordered_list.
+        """
+        scores = self.get_item_scores()
+        if top_count >= len(scores):
+            return np.ones(len(scores), dtype=bool)
+        kth = len(scores) - top_count
+        cutoff = np.partition(scores, kth)[kth]
+        top_rows = scores > cutoff
+        tied_rows = np.flatnonzero(scores == cutoff)
+        tied_rows = tied_rows[np.argsort(self.__item_sequences[tied_rows])]
+        top_rows[tied_rows[len(tied_rows) - (top_count - np.count_nonzero(top_rows)):]] = True
+        return top_rows
+
     def most_preferred(self, item_list=None, evaluation_needed=True):
         """Returns the most preferred item from a list.
+        
+        Only the items added, removed or updated since the last query are evaluated again, whatever
+        the value of evaluation_needed (kept for backward compatibility).
         """
-        # To be completed
         if item_list:
-            self.__item_list = item_list
-        if evaluation_needed:
-            self.__criterion_value_list = self.evaluate_items(self.__item_list)
-            self.__item_scores = [item.get_score(self) for item in self.__item_list]
-        score_max = max(self.__item_scores)
-        return self.__item_list[self.__item_scores.index(score_max)]
+            self.__sync_item_list(item_list)
+        scores = self.get_item_scores()
+        if self.__best_row is None:
+            best_rows = np.flatnonzero(scores == scores.max())
+            self.__best_row = int(best_rows[np.argmin(self.__item_sequences[best_rows])])
+        return self.__item_list[self.__best_row]
 
     def is_item_among_top_10_percent(self, item, item_list=None, evaluation_needed=True):
         """
         Return whether a given item is among the top 10 percent of the preferred items.
+        
+        As for most_preferred, only the changed items are evaluated again.
 
         :return: a boolean, True means that the item is among the favourite ones
         """
-        # To be completed
         if item_list:
-            if evaluation_needed:
-                self.__criterion_value_list = self.evaluate_items(item_list)
-            self.__item_list = item_list
+            self.__sync_item_list(item_list)
         
         assert self.__item_list, 'No existing item list assigned to the preferences object.'
         
-        if not self.__item_scores or item_list:
-            self.__item_scores = [item.get_score(self) for item in self.__item_list]
-        
-        if (not self.__item_ordered_list) or item_list:
-            sorted_score_index = sorted(zip(self.__item_scores,range(len(self.__item_list))), reverse=True)
-            self.__item_ordered_list = [self.__item_list[index] for _,index in sorted_score_index]
-        
-        is_top_item = self.__item_ordered_list.index(item) < int(0.1 * len(self.__item_ordered_list)) + 1
-        return is_top_item
+        top_count = int(0.1 * len(self.__item_list)) + 1
+        self.get_item_scores()
+        if self.__item_ordered_list is not None:
+            return self.rank_of(item) < top_count
+        if self.__top_items is None:
+            self.__top_items = self.__select_top_rows(top_count)
+        return bool(self.__top_items[self.__item_index[item]])
     
     def print_preferences_dict(self, item_list):
-        self.__item_list = item_list
-        self.__criterion_value_list = self.evaluate_items(item_list)
-        self.__item_scores = [item.get_score(self) for item in self.__item_list]
-        return {self.__item_list[index]._Item__name: self.__item_scores[index] for index in range(len(self.__item_list))}
-    
-    def has_better_item(self, item, criterion, value, bool_dec):           
-        item_index = self.__item_ordered_list.index(item)
-        for candidate_item in self.__item_ordered_list[:item_index]:
-            candidate_value = self.get_value(candidate_item, criterion)
-            if candidate_value.value > value.value and bool_dec:
-                return candidate_item
-            elif candidate_value.value < value.value and not bool_dec:
-                return candidate_item
-        return None
-
+        self.__sync_item_list(item_list)
+        return {item.get_name(): self.get_score(item) for item in item_list}
+    
+    def has_better_item(self, item, criterion, value, bool_dec):
+        """Returns the most preferred item among the ones preferred to the given item which has a better value
+        (worse if bool_dec is False) on the criterion, None if there is no such item.
+        
+        The candidates are selected on the whole evaluation matrix at once, without building the ordered list.
+        """
+        scores = self.get_item_scores()
+        sequences = self.__item_sequences
+        row = self.__item_index[item]
+        preferred_rows = (scores > scores[row]) | ((scores == scores[row]) & (sequences > sequences[row]))
+        column = self.__evaluation_matrix[:, self.__criterion_columns[criterion.name]]
+        candidates = preferred_rows & ((column > value.value) if bool_dec else (column < value.value))
+        candidate_rows = np.flatnonzero(candidates)
+        if len(candidate_rows) == 0:
+            return None
+        best_row = candidate_rows[np.lexsort((-sequences[candidate_rows], -scores[candidate_rows]))[0]]
+        return self.__item_list[best_row]
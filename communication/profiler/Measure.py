@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+import time
+
+
+class Measure:
+    """Measure class.
+    Context manager timing a with block for a profiler (see Profiler.measure).
+    """
+
+    __slots__ = ('profiler', 'key', 'wall_start', 'cpu_start')
+
+    def __init__(self, profiler, key):
+        self.profiler = profiler
+        self.key = key
+        self.wall_start = None
+        self.cpu_start = None
+
+    def __enter__(self):
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.profiler.add(self.key, time.perf_counter() - self.wall_start, time.process_time() - self.cpu_start)
+        return False
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+import time
+
+from communication.profiler.Measure import Measure
+
+
+class Profiler:
+    """Profiler class.
+    Class implementing the timing of the hot paths of the dialogues: number of calls, cumulative wall clock
+    and CPU time by key (a method, a message performative handler...).
+
+    Code is timed either in a with block (measure), or by instrumenting the methods of an object (instrument),
+    which replaces them on the instance only: the objects which are not instrumented run as fast as before.
+    The times of a method calling other timed methods include them.
+
+    The timings of several profilers (e.g. one per dialogue of a sweep, in other processes) are added up
+    with merge, and get_report / format_report give the aggregated report.
+
+    attr:
+        timings: [call count, wall time, CPU time] by key (dict)
+    """
+
+    def __init__(self):
+        """ Create a new profiler, without any timing.
+        """
+        self.__timings = {}
+
+    def add(self, key, wall_time, cpu_time, count=1):
+        """ Add the time of count calls to the timing of key.
+        """
+        timing = self.__timings.get(key)
+        if timing is None:
+            self.__timings[key] = [count, wall_time, cpu_time]
+        else:
+            timing[0] += count
+            timing[1] += wall_time
+            timing[2] += cpu_time
+
+    def measure(self, key):
+        """ Return a context manager timing its block under key.
+        """
+        return Measure(self, key)
+
+    def instrument(self, obj, method_name, key=None, key_function=None):
+        """ Time the calls to a method of obj under key (the method name by default), or under the key
+        returned by key_function(*args) for each call.
+        """
+        method = getattr(obj, method_name)
+        key = key or method_name
+        add = self.add
+        perf_counter = time.perf_counter
+        process_time = time.process_time
+
+        def timed_method(*args, **kwargs):
+            wall_start = perf_counter()
+            cpu_start = process_time()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                add(key_function(*args) if key_function else key,
+                    perf_counter() - wall_start, process_time() - cpu_start)
+
+        setattr(obj, method_name, timed_method)
+
+    def get_timings(self):
+        """ Return the timings by key, as (call count, wall time, CPU time) tuples.
+        """
+        return {key: tuple(timing) for key, timing in self.__timings.items()}
+
+    def merge(self, timings):
+        """ Add the timings of another profiler (Profiler or get_timings dict) to the ones of this profiler.
+        """
+        if isinstance(timings, Profiler):
+            timings = timings.get_timings()
+        for key, (count, wall_time, cpu_time) in timings.items():
+            self.add(key, wall_time, cpu_time, count)
+
+    def reset(self):
+        """ Forget all the timings.
+        """
+        self.__timings = {}
+
+    def get_report(self):
+        """ Return the report rows (key, call count, wall time, CPU time, mean wall time per call),
+        by decreasing wall time.
+        """
+        return sorted(
+            ((key, count, wall_time, cpu_time, wall_time / count)
+             for key, (count, wall_time, cpu_time) in self.__timings.items()),
+            key=lambda row: row[2], reverse=True,
+        )
+
+    def format_report(self):
+        """ Return the report as a text table, times in milliseconds (mean time per call in microseconds).
+        """
+        lines = ["{:<40} {:>9} {:>11} {:>11} {:>10}".format('key', 'calls', 'wall (ms)', 'cpu (ms)', 'mean (us)')]
+        for key, count, wall_time, cpu_time, mean_time in self.get_report():
+            lines.append("{:<40} {:>9} {:>11.3f} {:>11.3f} {:>10.2f}".format(
+                key, count, wall_time * 1e3, cpu_time * 1e3, mean_time * 1e6))
+        return '\n'.join(lines)
+
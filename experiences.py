@@ -1,10 +1,8 @@
-import sys
-
-
 from mesa import Model
 from mesa.time import RandomActivation
 
 from communication.agent.CommunicatingAgent import CommunicatingAgent
+from communication.logger.DialogueLogger import DialogueLogger
 from communication.message.MessageService import MessageService
 from communication.preferences.Preferences import Preferences
 from communication.preferences.EnginesCorpus import EnginesCorpus
@@ -22,8 +20,8 @@ from pw_argumentation import ArgumentAgent, ArgumentModel
 def evaluation_metric(agent1_prefs, agent2_prefs, agreed_item):
     # Calculates a metric for a dialogue between two agents based on their preferences and the agreed-upon item.
     # Find the rank of the agreed item in each agent's preferences
-    agent1_rank = agent1_prefs._Preferences__item_ordered_list.index(agreed_item)
-    agent2_rank = agent2_prefs._Preferences__item_ordered_list.index(agreed_item)
+    agent1_rank = agent1_prefs.rank_of(agreed_item)
+    agent2_rank = agent2_prefs.rank_of(agreed_item)
     # Calculate a score for the agreed item for each agent
     agent1_score = 1.0 / (agent1_rank + 1)
     agent2_score = 1.0 / (agent2_rank + 1)
@@ -37,34 +35,28 @@ if __name__ == "__main__":
     
     n = 50
     
-    sys.stdout = open(f'outputs/experiments_{n}_items.txt', 'a')
-    
-    argument_model = ArgumentModel(corpus_size=n)
-    print("Agents created")
-    for _ in range(10):
-        argument_model.step()
-    
-    agreed_item = argument_model.agent1.agreed_item
-    if argument_model.agent2.agreed_item and agreed_item:
+    with open(f'outputs/experiments_{n}_items.txt', 'a') as output:
+        argument_model = ArgumentModel(corpus_size=n, logger=DialogueLogger(output, buffer_size=256))
+        print("Agents created", file=output)
+        reason, step_count = argument_model.run_until_done()
+        print('Dialogue over ({}) after {} steps'.format(reason, step_count), file=output)
         
-        print(agreed_item)
+        agreed_item = argument_model.agent1.agreed_item
+        if argument_model.agent2.agreed_item and agreed_item:
+            
+            print(agreed_item, file=output)
+            
+            score = evaluation_metric(
+                argument_model.agent1.preferences,
+                argument_model.agent2.preferences,
+                agreed_item,
+            )
+        else:
+            score = 0
+        print('\nscore = ', score, file=output)
         
-        score = evaluation_metric(
-            argument_model.agent1.preferences,
-            argument_model.agent2.preferences,
-            agreed_item,
-        )
-    else:
-        score = 0
-    print('\nscore = ', score)
-    
-    
-    print('\n\n\n---------------------------------------------------------------------------------------\n\n\n\n')
-    
-    sys.stdout.close()
-    
-    sys.stdout = open(f'outputs/experiments_{n}_items_scores.txt', 'a')
-    
-    print('score = ', score)
+        
+        print('\n\n\n---------------------------------------------------------------------------------------\n\n\n\n', file=output)
     
-    sys.stdout.close()
\ No newline at end of file
+    with open(f'outputs/experiments_{n}_items_scores.txt', 'a') as output:
+        print('score = ', score, file=output)
@@ -1,18 +1,27 @@
+import io
+import multiprocessing
+import random
 import sys
 import time as t
 
+import numpy as np
 from mesa import Model
 from mesa.time import RandomActivation
 
 from communication.agent.CommunicatingAgent import CommunicatingAgent
+from communication.mailbox.ArchivedHistory import ArchivedHistory
 from communication.message.MessageService import MessageService
+from communication.message.AsyncMessageService import AsyncMessageService
+from communication.message.ProcessMessageService import ProcessMessageService
+from communication.logger.DialogueLogger import DialogueLogger
 from communication.preferences.Preferences import Preferences
 from communication.preferences.EnginesCorpus import EnginesCorpus
 from communication.message.Message import Message
 from communication.message.MessagePerformative import MessagePerformative
-from communication.preferences.CriterionName import criterionName_classdict
 from communication.preferences.Value import value_classdict
 from arguments.Argument import Argument
+from arguments.ArgumentPayload import ArgumentPayload
+from arguments.CoalitionRule import CoalitionRule
 from arguments.CoupleValue import CoupleValue
 from arguments.Comparison import Comparison
 
@@ -20,119 +29,190 @@ from arguments.Comparison import Comparison
 class ArgumentAgent(CommunicatingAgent):
     """ ArgumentAgent which inherit from CommunicatingAgent.
     """
-    def __init__ (self, unique_id, model, name):
-        super().__init__(unique_id, model, name)
+    def __init__ (self, unique_id, model, name, history_size=None, argumentation_policy='best_criterion',
+                  coalition_rule=None):
+        """history_size bounds the messages kept in memory by the mailbox (older ones are archived on disk)
+        and the arguments kept in memory by the argumentation history (older ones are archived on disk too,
+        and still read when iterating over it, see ArchivedHistory).
+        argumentation_policy is the policy used to choose the premisses of the arguments, see Argument.select_best_premiss.
+        coalition_rule decides when enough agents accepted an item proposed by the agent to commit to it
+        (CoalitionRule, every agent of a 2 agents dialogue by default)."""
+        if argumentation_policy not in Argument.ARGUMENTATION_POLICIES:
+            raise ValueError("unknown argumentation policy {}".format(argumentation_policy))
+        super().__init__(unique_id, model, name, history_size)
+        self.argumentation_policy = argumentation_policy
         self.preferences = None
         self.list_items = None
         self.interlocutor = None
+        self.peers = ()
+        self.coalition_rule = coalition_rule if coalition_rule is not None else CoalitionRule()
+        self.acceptances = {}
+        self.pending_commits = set()
         self.proposition_made = False
         self.has_proposed_best = False # Different than previous line, used for when we have to relaunch negociation after fail of the first proposed
         self.has_committed = False
         self.return_commit_received = False
         self.current_argument = None
-        self.argumentation = []
+        self.argumentation = [] if history_size is None else ArchivedHistory(history_size)
+        self.sent_arguments = set()
+        self.argument_count = 0
+        self.new_argument_count = 0
         self.agreed_item = None
+        self.logger = getattr(model, 'logger', None) or DialogueLogger()
         
     def step(self):
         super().step()
-        # check mailbox for message
-        new_messages = self.get_new_messages() # it is supposed to be a singleton
+        # check mailbox for messages, handled in the order they were received
+        new_messages = self.get_new_messages()
         if new_messages:
-            [new_message] = new_messages
-            if new_message._Message__message_performative == MessagePerformative.PROPOSE:
-                self.proposition_made = True
-                item_concerned = self.find_item_from_name(new_message.get_content())
-                if self.preferences.is_item_among_top_10_percent(item_concerned, evaluation_needed=False):
-                    self.accept_item(item_concerned)
-                else:
-                    self.ask_why_item(item_concerned)
-            elif new_message._Message__message_performative == MessagePerformative.ACCEPT:
-                item_concerned = self.find_item_from_name(new_message.get_content())
-                self.commit_item(item_concerned)
-            elif new_message._Message__message_performative == MessagePerformative.COMMIT:
-                self.return_commit_received = True
-                if self.has_committed:
-                    self.is_done()
-                else:
-                    item_concerned = self.find_item_from_name(new_message.get_content())
-                    self.commit_item(item_concerned)
-            elif new_message._Message__message_performative == MessagePerformative.ASK_WHY:
-                item_concerned = self.find_item_from_name(new_message.get_content())
-                self.support_proposal(item_concerned)
-            elif new_message._Message__message_performative == MessagePerformative.ARGUE:
-                content = new_message.get_content()
-                sender = new_message.get_exp()
-                self.argumentation.append({'sender': sender, 'content': content})
-                self.counter_argue(content)
-            elif new_message._Message__message_performative == MessagePerformative.STAND_BY and not self.has_proposed_best:
-                proposed_item = self.preferences.most_preferred()
-                self.propose_item(proposed_item)
+            for new_message in new_messages:
+                self.handle_message(new_message)
         elif not self.proposition_made:
+            # the first proposal is made to every other agent
             proposed_item = self.preferences.most_preferred()
-            self.propose_item(proposed_item)
+            self.propose_item(proposed_item, self.get_peers())
         elif self.has_committed and self.return_commit_received:
             self.is_done()
         else:
             self.stand_by()
 
+    def handle_message(self, new_message):
+        """Answer a message, the answers being sent to its sender."""
+        self.interlocutor = new_message.get_exp()
+        if new_message._Message__message_performative == MessagePerformative.PROPOSE:
+            self.proposition_made = True
+            item_concerned = self.find_item_from_name(new_message.get_content())
+            if self.preferences.is_item_among_top_10_percent(item_concerned, evaluation_needed=False):
+                self.accept_item(item_concerned)
+            else:
+                self.ask_why_item(item_concerned)
+        elif new_message._Message__message_performative == MessagePerformative.ACCEPT:
+            item_concerned = self.find_item_from_name(new_message.get_content())
+            self.accepted_item(item_concerned)
+        elif new_message._Message__message_performative == MessagePerformative.COMMIT:
+            self.pending_commits.discard(self.interlocutor)
+            if self.has_committed:
+                # done once every agent the item was committed to committed back
+                if not self.pending_commits:
+                    self.return_commit_received = True
+                    self.is_done()
+            else:
+                self.return_commit_received = True
+                item_concerned = self.find_item_from_name(new_message.get_content())
+                self.commit_item(item_concerned)
+        elif new_message._Message__message_performative == MessagePerformative.ASK_WHY:
+            item_concerned = self.find_item_from_name(new_message.get_content())
+            self.support_proposal(item_concerned)
+        elif new_message._Message__message_performative == MessagePerformative.ARGUE:
+            content = new_message.get_content()
+            self.argumentation.append({'sender': self.interlocutor, 'content': content})
+            self.counter_argue(content)
+        elif new_message._Message__message_performative == MessagePerformative.STAND_BY and not self.has_proposed_best:
+            proposed_item = self.preferences.most_preferred()
+            self.propose_item(proposed_item)
+
+    def accepted_item(self, item):
+        """Handle the acceptance of an item by the interlocutor: commit to it with the agents which accepted it
+        once they form a coalition with this agent."""
+        supporters = self.acceptances.setdefault(item._Item__name, set())
+        supporters.add(self.interlocutor)
+        if self.agreed_item is item:
+            self.pending_commits.add(self.interlocutor)
+            self.commit_item(item)
+        elif self.coalition_rule.is_coalition(len(supporters) + 1):
+            for supporter in supporters:
+                self.pending_commits.add(supporter)
+                self.commit_item(item, supporter)
+
     def get_preference(self):
         return self.preferences
 
-    def generate_preferences(self, List_items):
+    def generate_preferences(self, List_items, preferences=None, name_index=None, rng=None):
+        """Draw the agent preferences over List_items, unless already generated ones are given
+        (e.g. built for many agents at once with Preferences.generate_batch).
+        
+        name_index is the name -> item index of the corpus, shared by the agents to find items from message contents.
+        rng is the random.Random the preferences are drawn from (the random module if None).
+        """
         self.list_items = List_items
-        self.preferences = Preferences(List_items)
+        self.preferences = preferences if preferences is not None else Preferences(List_items, name_index, rng=rng)
     
     def set_interlocutor(self, other_agent):
         self.interlocutor = other_agent.get_name()
     
-    def propose_item(self, item):
-        message = Message(self.get_name(), self.interlocutor, MessagePerformative.PROPOSE, item._Item__name)
-        self.send_message(message)
+    def set_peers(self, agent_names):
+        """Set the names of the agents negotiating (the agent's own name may be included, it is skipped)."""
+        self.peers = agent_names
+    
+    def get_peers(self):
+        """Return the names of the other agents negotiating, or the interlocutor if no peers were set."""
+        if not self.peers:
+            return [self.interlocutor]
+        return [agent_name for agent_name in self.peers if agent_name != self.get_name()]
+    
+    def propose_item(self, item, dests=None):
+        """Propose an item to the given agents, the interlocutor by default."""
+        for dest in dests or [self.interlocutor]:
+            message = Message(self.get_name(), dest, MessagePerformative.PROPOSE, item._Item__name)
+            self.send_message(message)
+            self.log_message(message)
         self.proposition_made = True
         self.has_proposed_best = True
-        print(self.get_name(), ' - ', message._Message__message_performative, '(', item._Item__name, ')')
     
     def accept_item(self, item):
         message = Message(self.get_name(), self.interlocutor, MessagePerformative.ACCEPT, item._Item__name)
         self.send_message(message)
-        print(self.get_name(), ' - ', message._Message__message_performative, '(', item._Item__name, ')')
+        self.log_message(message)
     
     def ask_why_item(self, item):
         message = Message(self.get_name(), self.interlocutor, MessagePerformative.ASK_WHY, item._Item__name)
         self.send_message(message)
-        print(self.get_name(), ' - ', message._Message__message_performative, '(', item._Item__name, ')')
+        self.log_message(message)
         
-    def commit_item(self, item):
-        message = Message(self.get_name(), self.interlocutor, MessagePerformative.COMMIT, item._Item__name)
+    def commit_item(self, item, dest=None):
+        """Commit to an item with the given agent, the interlocutor by default."""
+        message = Message(self.get_name(), dest or self.interlocutor, MessagePerformative.COMMIT, item._Item__name)
         self.send_message(message)
         self.has_committed = True
         self.agreed_item = item
-        print(self.get_name(), ' - ', message._Message__message_performative, '(', item._Item__name, ')')
+        self.log_message(message)
         
     def support_proposal(self, item):
         """Send first argument after receiving ASK_WHY message."""
         
         self.current_argument = Argument(True, item._Item__name)
         self.current_argument.List_supporting_proposal(item._Item__name, self.preferences)
-        _, couple_value = self.current_argument.select_best_premiss()
-        arg_content = f'{"NOT " if not(self.current_argument.boolean_decision) else ""}{item._Item__name}, {str(couple_value)}'
-        
+        _, couple_value = self.current_argument.select_best_premiss(self.argumentation_policy)
+        arg_content = ArgumentPayload(self.current_argument.boolean_decision, item._Item__name, couple_value)
+        self.send_argument(arg_content)
+    
+    def send_argument(self, arg_content):
+        """Send an ARGUE message, counting the arguments sent and the ones never sent before."""
         message = Message(self.get_name(), self.interlocutor, MessagePerformative.ARGUE, arg_content)
+        self.argument_count += 1
+        key = arg_content.get_key()
+        if key not in self.sent_arguments:
+            self.sent_arguments.add(key)
+            self.new_argument_count += 1
         self.send_message(message)
-        print(self.get_name(), ' - ', message._Message__message_performative, '(', arg_content, ')')
+        self.log_message(message)
     
     def process_couple_value(self, str_couple_value):
         """Accept a str like CRITERION = VALUE and transform it to CoupleValue object."""
         [criterion, value] = str_couple_value.split(' = ')
-        return CoupleValue(criterionName_classdict[criterion], value_classdict[value])
+        return CoupleValue(self.preferences.get_criteria()[criterion], value_classdict[value])
     
     def process_comparison(self, str_comparison):
         """Accept a str like CRITERION1 > CRITERION2 and transform it to Comparison object."""
         [criterion1, criterion2] = str_comparison.split(' > ')
-        return Comparison(criterionName_classdict[criterion1], criterionName_classdict[criterion2])
+        criteria = self.preferences.get_criteria()
+        return Comparison(criteria[criterion1], criteria[criterion2])
     
     def argument_parsing(self, argument_content):
-        """Return the premisses and the conclusion of the given argument message content.
+        """Return the premisses and the conclusion of the given argument message content, as an ArgumentPayload.
+        
+        Arguments are sent as ArgumentPayload objects, returned as is. Their textual form (str) is parsed,
+        e.g. for arguments read from a log.
         
         Argument content has format : CONCLUSION, PREMISS1 [and PREMISS2 ... and PREMISS_N]
         
@@ -152,6 +232,8 @@ class ArgumentAgent(CommunicatingAgent):
         
         comparative symbols between values are here to inverse if the conclusion is negative (attacking an item)
         """
+        if isinstance(argument_content, ArgumentPayload):
+            return argument_content
         conclusion, premisses = argument_content.split(', ')
         if len(conclusion) > 3:
             boolean_decision = conclusion[:4] != "NOT "
@@ -163,104 +245,63 @@ class ArgumentAgent(CommunicatingAgent):
         if len(premiss_list) > 1:
             str_comparison = premiss_list[1]
             comparison = self.process_comparison(str_comparison)
-        return {
-            'boolean_decision': boolean_decision,
-            'item_name': item_name,
-            'couple_value': couple_value,
-            'comparison': comparison,
-        }
+        return ArgumentPayload(boolean_decision, item_name, couple_value, comparison)
     
     def find_item_by_name(self, item_name):
-        for item in self.preferences._Preferences__item_list:
-            if item._Item__name == item_name:
-                return item
+        return self.preferences.get_item_from_name(item_name)
     
-    def generate_counter_argument(self, argument_elements):
-        """Input the parsed argument_message and if argument is attackable, give the best counter argument."""
-        item = self.find_item_from_name(argument_elements['item_name'])
-        bool_dec = argument_elements['boolean_decision']
+    def generate_counter_argument(self, argument):
+        """Input the received argument (ArgumentPayload) and if argument is attackable, give the best counter argument."""
+        item = self.find_item_from_name(argument.item_name)
+        bool_dec = argument.boolean_decision
         # Argument can have either of the 3 types defined above
-        comparison = argument_elements['comparison']
-        couple_value = argument_elements['couple_value']
+        comparison = argument.comparison
+        couple_value = argument.couple_value
         # Case : ITEM, C = VALUE and C > C0
         if comparison:
             best_crit = comparison.best_criterion_name
             if bool_dec:
                 better_item = self.preferences.has_better_item(item, best_crit, couple_value.value, bool_dec)
                 if better_item:
-                    return {
-                        'couple_value': CoupleValue(best_crit, self.preferences.get_value(better_item, best_crit)),
-                        'comparison': None,
-                        'counter_bd': bool_dec,
-                        'item': better_item,
-                    }
+                    better_value = self.preferences.get_value(better_item, best_crit)
+                    return ArgumentPayload(bool_dec, better_item.get_name(), CoupleValue(best_crit, better_value))
             worst_crit = comparison.worst_criterion_name
             if self.preferences.is_preferred_criterion(worst_crit, best_crit):
                 worst_eval = self.preferences.get_value(item, worst_crit)
                 if worst_eval.value <= 1 and bool_dec:
                     counter_cv = CoupleValue(worst_crit, worst_eval)
                     counter_cmp = Comparison(worst_crit, best_crit)
-                    return {
-                        'couple_value': counter_cv,
-                        'comparison': counter_cmp,
-                        'counter_bd': not bool_dec,
-                        'item': item,
-                    }
+                    return ArgumentPayload(not bool_dec, item.get_name(), counter_cv, counter_cmp)
                 elif worst_eval.value >= 2 and not bool_dec:
                     counter_cv = CoupleValue(worst_crit, worst_eval)
                     counter_cmp = Comparison(worst_crit, best_crit)
-                    return {
-                        'couple_value': counter_cv,
-                        'comparison': counter_cmp,
-                        'counter_bd': not bool_dec,
-                        'item': item,
-                    }   
+                    return ArgumentPayload(not bool_dec, item.get_name(), counter_cv, counter_cmp)
         # Case : ITEM, C = VALUE
         else:
             best_crit = couple_value.criterion_name
             if bool_dec:
                 better_item = self.preferences.has_better_item(item, best_crit, couple_value.value, bool_dec)
                 if better_item:
-                    return {
-                        'couple_value': CoupleValue(best_crit, self.preferences.get_value(better_item, best_crit)),
-                        'comparison': None,
-                        'counter_bd': bool_dec,
-                        'item': better_item,
-                    }
+                    better_value = self.preferences.get_value(better_item, best_crit)
+                    return ArgumentPayload(bool_dec, better_item.get_name(), CoupleValue(best_crit, better_value))
             eval = self.preferences.get_value(item, best_crit)
             if eval.value <= 1 and bool_dec:
-                return {
-                    'couple_value': CoupleValue(best_crit, eval),
-                    'comparison': None,
-                    'counter_bd': not bool_dec,
-                    'item': item,
-                }
+                return ArgumentPayload(not bool_dec, item.get_name(), CoupleValue(best_crit, eval))
             if eval.value >= 2 and not bool_dec:
-                return {
-                    'couple_value': CoupleValue(best_crit, eval),
-                    'comparison': None,
-                    'counter_bd': not bool_dec,
-                    'item': item,
-                }
+                return ArgumentPayload(not bool_dec, item.get_name(), CoupleValue(best_crit, eval))
             else:
-                for criterion in self.preferences._Preferences__criterion_name_list:
+                for criterion in self.preferences.get_criterion_name_list():
                     if criterion == best_crit:
                         break
                     eval = self.preferences.get_value(item, criterion)
                     if eval.value <= 1 and bool_dec:
-                        return {
-                            'couple_value': CoupleValue(criterion, eval),
-                            'comparison': Comparison(criterion, best_crit),
-                            'counter_bd': not bool_dec,
-                            'item': item,
-                        }
+                        return ArgumentPayload(
+                            not bool_dec, item.get_name(), CoupleValue(criterion, eval), Comparison(criterion, best_crit),
+                        )
                     elif eval.value >= 2 and not bool_dec:
-                        return {
-                            'couple_value': CoupleValue(criterion, eval),
-                            'comparison': Comparison(criterion, best_crit),
-                            'counter_bd': not bool_dec,
-                            'item': item,
-                        }
+                        return ArgumentPayload(
+                            not bool_dec, item.get_name(), CoupleValue(criterion, eval), Comparison(criterion, best_crit),
+                        )
         return None 
     
     
@@ -271,82 +312,358 @@ class ArgumentAgent(CommunicatingAgent):
         counter = self.generate_counter_argument(parsed_arg)
         
         if counter is None:
-            if parsed_arg['boolean_decision']:
-                item = self.find_item_from_name(parsed_arg['item_name'])
+            if parsed_arg.boolean_decision:
+                item = self.find_item_from_name(parsed_arg.item_name)
                 self.accept_item(item)
             elif not self.has_proposed_best:
                 self.propose_item(self.preferences.most_preferred(evaluation_needed=False))
             else:
                 self.stand_by_propose()
         else:
-            bool_dec = counter['counter_bd']
-            item_name = counter['item']._Item__name
-            cv = counter['couple_value']
-            cmp = counter['comparison']
-            arg_content = f'{"NOT " if not(bool_dec) else ""}{item_name}, {str(cv)}{" and " if cmp else ""}{str(cmp) if cmp else ""}'
-            message = Message(self.get_name(), self.interlocutor, MessagePerformative.ARGUE, arg_content)
-            self.argumentation.append({'sender': self.get_name(), 'content': arg_content})
-            self.send_message(message)
-            print(self.get_name(), ' - ', message._Message__message_performative, '(', arg_content, ')')
+            self.argumentation.append({'sender': self.get_name(), 'content': counter})
+            self.send_argument(counter)
     
     def stand_by_propose(self):
         message = Message(self.get_name(), self.interlocutor, MessagePerformative.STAND_BY, 'I am in stand by.')
         self.send_message(message)
-        print(self.get_name(), ' -  Stand by, waiting for answers from {}'.format(self.interlocutor))
+        self.log_message(message)
     
     def stand_by(self):
-        print(self.get_name(), ' -  Stand by, waiting for answers from {}'.format(self.interlocutor))
+        self.logger.log_status(self.model.schedule.steps, self.get_name(), DialogueLogger.WAITING, self.interlocutor)
     
     def is_done(self):
-        print(self.get_name(), ' -  Stand by, has agreed with {}'.format(self.interlocutor))
+        self.logger.log_status(self.model.schedule.steps, self.get_name(), DialogueLogger.AGREED, self.interlocutor)
+    
+    def log_message(self, message):
+        """Log a message sent by the agent, with the current step of the model."""
+        self.logger.log_message(self.model.schedule.steps, message)
     
     def find_item_from_name(self, item_name):
-        for item in self.list_items:
-            if item._Item__name == item_name:
-                return item
+        return self.preferences.get_item_from_name(item_name)
     
 
+class PartitionedActivation(RandomActivation):
+    """ Random activation of the agents of a dialogue partitioned across processes.
+
+    The schedule of a worker only holds its own agents, but every worker shuffles the names of all the agents
+    of the dialogue with the same random stream (the one of its model), so that the workers agree on the
+    activation order of each step: the same order as RandomActivation with all the agents. Each worker steps
+    its agents in this order.
+
+    attr:
+        agent_names: the names of all the agents of the dialogue, in the order they were created (list)
+        activation_order: the names of all the agents in the order of the last step (list)
+    """
+    def __init__(self, model, agent_names):
+        super().__init__(model)
+        self.agent_names = list(agent_names)
+        self.activation_order = []
+
+    def step(self):
+        self.activation_order = list(self.agent_names)
+        self.model.random.shuffle(self.activation_order)
+        agents = {agent.get_name(): agent for agent in self.agents}
+        for agent_name in self.activation_order:
+            agent = agents.get(agent_name)
+            if agent is not None:
+                agent.step()
+        self.steps += 1
+        self.time += 1
+
+
 class ArgumentModel(Model):
     """ ArgumentModel which inherit from Model.
+
+    By default the agents are stepped by the scheduler (step). With asynchronous=True they run as coroutines
+    reacting to their messages instead (run_async), so that many dialogues can run on one event loop.
+
+    With partition=(worker_id, routes, inboxes) the model is the part of a dialogue run by one worker process
+    (see ProcessMessageService and run_in_processes), which needs a seed: only the agents routed to worker_id
+    are created, with their preferences, the others living in other processes. Every worker draws the
+    activation order of all the agents (see PartitionedActivation) and the messages are delivered at the
+    beginning of the next step in this order, so that the dialogue does not depend on the number of workers.
+
+    With a seed, the activation order and the preferences of each agent are drawn from independent random
+    streams derived from it (see create_rng): an agent gets the same preferences whatever the agents created
+    with it, and a dialogue is reproduced from its seed alone. A partitioned dialogue, whose messages are
+    delivered one step later than with the default instant delivery, has the same outcome whatever the number
+    of workers (checked by TestArgument). Without seed, they are drawn from the random module and the mesa
+    model generator.
+    From BATCH_PREFERENCES_MIN_AGENTS agents, the preferences of all the agents are drawn at once by
+    Preferences.generate_batch (from the agent streams of the seed), which classifies the corpus for every
+    agent in one numpy operation.
+
+    agent_count agents (agent1, agent2, ...) negotiate over the corpus. The first proposal is made to all the
+    other agents, which then answer to the sender of each message they receive: the number of messages of a
+    step grows linearly with the number of agents. An agent commits to its item with the agents which accepted
+    it once they form a coalition according to coalition_rule ('all', 'majority' or 'quorum' of quorum agents,
+    see CoalitionRule).
+
+    The messages and the status of the agents are logged by logger (DialogueLogger), printed as they are sent
+    by default. A buffered logger is flushed at the end of run_until_done and run_async.
+
+    With a profiler (Profiler), the hot paths of the dialogue are timed (see instrument): the steps of the
+    agents, the handling of the messages by performative, the counter arguments, the preference queries and
+    the message dispatch. Without profiler nothing is instrumented.
     """
-    def __init__(self, corpus_size=10):
-        self.schedule = RandomActivation(self)
-        self.__messages_service = MessageService(self.schedule)
+    # spawn keys of the random streams derived from the seed: the activation order, then one per agent
+    # (the corpus is not drawn at random)
+    ACTIVATION_STREAM = 0
+    AGENT_STREAMS = 1
+
+    # from this number of agents, their preferences are drawn at once (see Preferences.generate_batch)
+    BATCH_PREFERENCES_MIN_AGENTS = 100
+
+    # reasons for which run_until_done stops
+    AGREEMENT = 'agreement'
+    STALLED = 'stalled'
+    REPEATED_ARGUMENTS = 'repeated_arguments'
+    MAX_STEPS = 'max_steps'
+
+    # preference queries timed by instrument
+    PROFILED_QUERIES = ('get_value', 'has_better_item', 'is_item_among_top_10_percent', 'most_preferred', 'rank_of')
+
+    def __init__(self, corpus_size=10, columnar_corpus=False, history_size=None, asynchronous=False, partition=None,
+                 argumentation_policy='best_criterion', seed=None, agent_count=2, coalition_rule='all', quorum=None,
+                 logger=None, profiler=None):
+        self.seed = seed
+        self.logger = logger if logger is not None else DialogueLogger()
+        if seed is not None:
+            self.random = ArgumentModel.create_rng(seed, ArgumentModel.ACTIVATION_STREAM)
+        agent_names = ArgumentModel.get_agent_names(agent_count)
+        self.asynchronous = asynchronous
+        if asynchronous and partition is not None:
+            raise ValueError("a model can not be both asynchronous and partitioned across processes")
+        if partition is not None and seed is None:
+            raise ValueError("a model partitioned across processes needs a seed, for its workers to agree")
+        self.schedule = RandomActivation(self) if partition is None else PartitionedActivation(self, agent_names)
+        if asynchronous:
+            self.message_service = AsyncMessageService(self.schedule)
+        elif partition is not None:
+            self.message_service = ProcessMessageService(self.schedule, *partition)
+        else:
+            self.message_service = MessageService(self.schedule)
         self.current_id = 0
 
-        corpus = EnginesCorpus(corpus_size)
+        corpus = EnginesCorpus(corpus_size, columnar=columnar_corpus)
         list_items = corpus.generate_engines_list()
+        name_index = corpus.get_name_index()
         
-        self.agent1 = ArgumentAgent(self.next_id(), self, "agent1")
-        self.agent1.generate_preferences(list_items)
-        self.schedule.add(self.agent1)
-        
-        self.agent2 = ArgumentAgent(self.next_id(), self, "agent2")
-        self.agent2.generate_preferences(list_items)
-        self.schedule.add(self.agent2)
+        self.coalition_rule = CoalitionRule(coalition_rule, agent_count, quorum)
+        local_indices = [agent_index for agent_index, agent_name in enumerate(agent_names) if self.__is_local(agent_name)]
+        batch = None
+        if agent_count >= ArgumentModel.BATCH_PREFERENCES_MIN_AGENTS:
+            batch = dict(zip(local_indices, Preferences.generate_batch(
+                list_items, agent_count, rng=self.__batch_seed(), name_index=name_index, agent_indices=local_indices)))
+        self.argument_agents = []
+        for agent_index, agent_name in enumerate(agent_names):
+            unique_id = self.next_id()
+            if not self.__is_local(agent_name):
+                continue
+            agent = ArgumentAgent(unique_id, self, agent_name, history_size, argumentation_policy, self.coalition_rule)
+            if batch is None:
+                agent.generate_preferences(list_items, name_index=name_index, rng=self.__agent_rng(agent_index))
+            else:
+                agent.generate_preferences(list_items, batch[agent_index], name_index)
+            agent.set_peers(agent_names)
+            self.schedule.add(agent)
+            self.argument_agents.append(agent)
         
-        self.agent1.set_interlocutor(self.agent2)
-        self.agent2.set_interlocutor(self.agent1)
+        # agent1 and agent2 are None in the workers they do not live in
+        agents = {agent.get_name(): agent for agent in self.argument_agents}
+        self.agent1 = agents.get(agent_names[0])
+        self.agent2 = agents.get(agent_names[1]) if agent_count > 1 else None
+        if agent_count == 2:
+            for agent in self.argument_agents:
+                agent.interlocutor = agent.get_peers()[0]
+
+        self.profiler = profiler
+        if profiler is not None:
+            self.instrument(profiler)
 
         self.running = True
 
+    @staticmethod
+    def get_agent_names(agent_count):
+        """Return the names of the agents of a model of agent_count agents."""
+        return tuple("agent{}".format(agent_index + 1) for agent_index in range(agent_count))
+
+    @staticmethod
+    def create_rng(seed, *spawn_key):
+        """Return the random.Random of the stream spawn_key derived from seed, independent of the other streams."""
+        state = np.random.SeedSequence(seed, spawn_key=spawn_key).generate_state(4)
+        return random.Random(int.from_bytes(state.tobytes(), 'little'))
+
+    def __agent_rng(self, agent_index):
+        if self.seed is None:
+            return None
+        return ArgumentModel.create_rng(self.seed, ArgumentModel.AGENT_STREAMS, agent_index)
+
+    def __batch_seed(self):
+        # the batch is drawn from the agent streams of the seed, else from the random module as single agents
+        if self.seed is None:
+            return random.getrandbits(64)
+        return np.random.SeedSequence(self.seed, spawn_key=(ArgumentModel.AGENT_STREAMS,))
+
+    def instrument(self, profiler):
+        """Time the hot paths of the dialogue with profiler, the messages being timed by performative."""
+        profiler.instrument(self.message_service, 'dispatch_message', 'MessageService.dispatch_message')
+        profiler.instrument(self.message_service, 'dispatch_messages', 'MessageService.dispatch_messages')
+        for agent in self.argument_agents:
+            profiler.instrument(agent, 'step', 'ArgumentAgent.step')
+            profiler.instrument(agent, 'handle_message', key_function=ArgumentModel.get_handler_key)
+            profiler.instrument(agent, 'generate_counter_argument', 'ArgumentAgent.generate_counter_argument')
+            for query in ArgumentModel.PROFILED_QUERIES:
+                profiler.instrument(agent.preferences, query, 'Preferences.' + query)
+
+    @staticmethod
+    def get_handler_key(message):
+        """Return the profiler key of the handling of a message."""
+        return 'handle ' + message.get_performative().name
+
+    def __is_local(self, agent_name):
+        return not isinstance(self.message_service, ProcessMessageService) or \
+            self.message_service.is_local(agent_name)
+
     def step(self):
-        self.__messages_service.dispatch_messages()
+        self.message_service.dispatch_messages()
         self.schedule.step()
+        if isinstance(self.schedule, PartitionedActivation):
+            self.message_service.set_sender_order(self.schedule.activation_order)
+
+    def get_coalition(self):
+        """Return the largest group of agents which committed to the same item and received the commits they
+        expected, with the name of the item (None if there is no such agent)."""
+        coalitions = {}
+        for agent in self.schedule.agents:
+            if agent.has_committed and agent.return_commit_received:
+                coalitions.setdefault(agent.agreed_item._Item__name, []).append(agent)
+        if not coalitions:
+            return None, []
+        return max(coalitions.items(), key=lambda coalition: len(coalition[1]))
+
+    def is_agreement(self):
+        """Return True if agents committed to the same item form a coalition according to the coalition rule."""
+        _, coalition = self.get_coalition()
+        return self.coalition_rule.is_coalition(len(coalition))
+
+    def run_until_done(self, max_steps=100):
+        """Step until the dialogue is over, or max_steps steps were made.
+        
+        Return the reason of the end and the number of steps made:
+            AGREEMENT: a coalition of agents committed to an item (see is_agreement)
+            STALLED: a step went by without any message (nothing can happen any more, e.g. after a STAND_BY)
+            REPEATED_ARGUMENTS: all the messages of a step were arguments already sent, which makes the agents
+                argue in circles (other messages, e.g. the proposals and commits of other agents of an N agents
+                negotiation, can still lead to an agreement)
+            MAX_STEPS: none of the above before max_steps steps
+
+        Not available for a model partitioned across processes: a worker only sees its own agents, so it can
+        not tell that the dialogue is over.
+        """
+        if isinstance(self.message_service, ProcessMessageService):
+            raise ValueError("run_until_done can not run a model partitioned across processes, step it instead")
+        agents = self.schedule.agents
+        for step_count in range(1, max_steps + 1):
+            sent_count = self.message_service.get_sent_count()
+            argument_count = sum(agent.argument_count for agent in agents)
+            new_argument_count = sum(agent.new_argument_count for agent in agents)
+            self.step()
+            if self.is_agreement():
+                reason = ArgumentModel.AGREEMENT
+            elif self.message_service.get_sent_count() == sent_count:
+                reason = ArgumentModel.STALLED
+            elif sum(agent.argument_count for agent in agents) - argument_count == \
+                    self.message_service.get_sent_count() - sent_count and \
+                    sum(agent.new_argument_count for agent in agents) == new_argument_count:
+                reason = ArgumentModel.REPEATED_ARGUMENTS
+            else:
+                continue
+            self.logger.flush()
+            return reason, step_count
+        self.logger.flush()
+        return ArgumentModel.MAX_STEPS, max_steps
+
+    async def run_async(self, max_steps=10):
+        """Run the dialogue until it is over or each agent made max_steps steps (None for no limit),
+        the model being created with asynchronous=True."""
+        if not self.asynchronous:
+            raise ValueError("run_async needs a model created with asynchronous=True")
+        await self.message_service.run_agents(self.schedule.agents, max_steps)
+        self.logger.flush()
+        self.running = False
+
+
+def run_worker(worker_id, routes, inboxes, results, seed, step_count, corpus_size, history_size, agent_count,
+               coalition_rule, quorum, log_level=DialogueLogger.OFF):
+    """Run the part of a dialogue hosted by one worker process, see run_in_processes."""
+    # the transcript of the worker is kept in memory and sent back with the results, so that the workers
+    # do not write to the same stdout
+    transcript = io.StringIO()
+    logger = DialogueLogger(transcript, level=log_level, buffer_size=256)
+    # each worker only creates its agents, their preferences being drawn from their streams of the seed
+    model = ArgumentModel(
+        corpus_size, history_size=history_size, partition=(worker_id, routes, inboxes), seed=seed,
+        agent_count=agent_count, coalition_rule=coalition_rule, quorum=quorum, logger=logger,
+    )
+    for _ in range(step_count):
+        model.step()
+    model.message_service.close()
+    logger.flush()
+    results.put((worker_id, {
+        agent.get_name(): agent.agreed_item.get_name() if agent.agreed_item else None
+        for agent in model.schedule.agents
+    }, transcript.getvalue()))
+
+
+def run_in_processes(corpus_size=10, step_count=10, worker_count=2, history_size=None, seed=None, agent_count=2,
+                     coalition_rule='all', quorum=None, log_level=DialogueLogger.OFF, log_stream=None):
+    """Run a dialogue with its agents partitioned across worker_count processes, messages being exchanged
+    through multiprocessing queues (no broker needed).
+
+    The dialogue is not logged by default. With a log_level, the transcript of each worker (the messages
+    sent by its agents) is written to log_stream (sys.stdout if None) once the dialogue is over, one worker
+    after the other.
+
+    Return the name of the item agreed by each agent (None if no agreement) by agent name.
+    """
+    context = multiprocessing.get_context()
+    if seed is None:
+        seed = random.getrandbits(64)
+    routes = {name: index % worker_count for index, name in enumerate(ArgumentModel.get_agent_names(agent_count))}
+    inboxes = ProcessMessageService.create_inboxes(worker_count, context)
+    results = context.Queue()
+    workers = [
+        context.Process(target=run_worker, args=(
+            worker_id, routes, inboxes, results, seed, step_count, corpus_size, history_size, agent_count,
+            coalition_rule, quorum, log_level,
+        ))
+        for worker_id in range(worker_count)
+    ]
+    for worker in workers:
+        worker.start()
+    agreed_items = {}
+    transcripts = {}
+    for _ in workers:
+        worker_id, worker_agreed_items, transcripts[worker_id] = results.get()
+        agreed_items.update(worker_agreed_items)
+    for worker in workers:
+        worker.join()
+    stream = log_stream if log_stream is not None else sys.stdout
+    for worker_id in sorted(transcripts):
+        stream.write(transcripts[worker_id])
+    return agreed_items
     
 
 
 if __name__ == "__main__":
     
-    sys.stdout = open(f'outputs/experiments.txt', 'a')
+    with open(f'outputs/experiments.txt', 'a') as output:
+        argument_model = ArgumentModel(logger=DialogueLogger(output, buffer_size=256))
+        print("Agents created", file=output)
+        reason, step_count = argument_model.run_until_done()
+        print('Dialogue over ({}) after {} steps'.format(reason, step_count), file=output)
         
-    argument_model = ArgumentModel()
-    print("Agents created")
-    for _ in range(10):
-        argument_model.step()
-    
-    print('\n\n\n---------------------------------------------------------------------------------------\n\n\n\n')
-    
-    sys.stdout.close()
+        print('\n\n\n---------------------------------------------------------------------------------------\n\n\n\n', file=output)
 
         # To be completed
\ No newline at end of file
@@ -2,15 +2,31 @@
 """
 Testing all the functionalities of the communication package.
 """
+import asyncio
+import io
+import multiprocessing
 
 from mesa import Model
 from mesa.time import RandomActivation
 
+from arguments.ArgumentPayload import ArgumentPayload
+from arguments.Comparison import Comparison
+from arguments.CoupleValue import CoupleValue
+
 from communication.agent.CommunicatingAgent import CommunicatingAgent
+from communication.logger.DialogueLogger import DialogueLogger
+from communication.mailbox.ArchivedHistory import ArchivedHistory
 from communication.mailbox.Mailbox import Mailbox
+from communication.mailbox.MessageArchive import MessageArchive
 from communication.message.Message import Message
+from communication.message.MessageCodec import MessageCodec
 from communication.message.MessagePerformative import MessagePerformative
 from communication.message.MessageService import MessageService
+from communication.message.AsyncMessageService import AsyncMessageService
+from communication.message.ProcessMessageService import ProcessMessageService
+from communication.profiler.Profiler import Profiler
+from communication.preferences.CriterionName import Criterion, CriterionName
+from communication.preferences.Value import Value
 
 
 class TestAgent(CommunicatingAgent):
@@ -23,22 +39,96 @@ class TestAgent(CommunicatingAgent):
         super().step()
 
 
+class CountdownAgent(TestAgent):
+    """ CountdownAgent which answers each number received by the previous one, awaiting a (simulated) slow
+    service before each step, to test the asynchronous execution of the agents.
+    """
+    def __init__(self, unique_id, model, name, interlocutor, start):
+        super().__init__(unique_id, model, name)
+        self.interlocutor = interlocutor
+        self.start = start
+
+    async def async_step(self):
+        await asyncio.sleep(0.01)
+        await super().async_step()
+
+    def step(self):
+        new_messages = self.get_new_messages()
+        if self.start is not None:
+            self.send_message(Message(self.get_name(), self.interlocutor, MessagePerformative.INFORM_REF, self.start))
+            self.start = None
+        for message in new_messages:
+            if message.get_content() > 0:
+                self.send_message(Message(self.get_name(), self.interlocutor, MessagePerformative.INFORM_REF,
+                                          message.get_content() - 1))
+
+
 class TestModel(Model):
     """ TestModel which inherit from Model to test CommunicatingAgent and MessageService.
     """
     def __init__(self):
         self.schedule = RandomActivation(self)
-        self.__messages_service = MessageService(self.schedule)
+        self.message_service = MessageService(self.schedule)
         for i in range(2):
             a = TestAgent(i, self, "Agent" + str(i))
             self.schedule.add(a)
         self.running = True
 
     def step(self):
-        self.__messages_service.dispatch_messages()
+        self.message_service.dispatch_messages()
         self.schedule.step()
 
 
+class TestAsyncModel(Model):
+    """ TestAsyncModel which inherit from Model to test the asynchronous execution of the agents.
+    """
+    def __init__(self, start):
+        self.schedule = RandomActivation(self)
+        self.message_service = AsyncMessageService(self.schedule)
+        self.schedule.add(CountdownAgent(0, self, "Agent0", "Agent1", start))
+        self.schedule.add(CountdownAgent(1, self, "Agent1", "Agent0", None))
+        self.running = True
+
+    async def run(self):
+        await self.message_service.run_agents(self.schedule.agents)
+
+
+class TestWorkerModel(Model):
+    """ TestWorkerModel which inherit from Model to test the agents partitioned across processes: the worker
+    hosts one agent, which sends a message to the agent of each other worker at each step.
+    """
+    def __init__(self, worker_id, routes, inboxes):
+        self.schedule = RandomActivation(self)
+        self.message_service = ProcessMessageService(self.schedule, worker_id, routes, inboxes)
+        self.agent = TestAgent(worker_id, self, "Agent" + str(worker_id))
+        self.schedule.add(self.agent)
+        self.running = True
+
+    def step(self):
+        self.message_service.dispatch_messages()
+        for agent_name in ROUTES:
+            if agent_name != self.agent.get_name():
+                self.agent.send_message(Message(self.agent.get_name(), agent_name, MessagePerformative.INFORM_REF, 0))
+        self.schedule.step()
+
+
+class HugeCriterion(Criterion):
+    """ Criterion enumeration whose value can not be encoded by MessageCodec.
+    """
+    FAR = 70000, 'FAR'
+
+
+ROUTES = {"Agent0": 0, "Agent1": 1, "Agent2": 2}
+
+
+def run_test_worker(worker_id, inboxes, results):
+    worker_model = TestWorkerModel(worker_id, ROUTES, inboxes)
+    for _ in range(5):
+        worker_model.step()
+    worker_model.message_service.close()
+    results.put((len(worker_model.agent.get_messages()), worker_model.message_service.get_sent_count()))
+
+
 if __name__ == "__main__":
     print("*---- Testing communication package ----")
     print("*")
@@ -65,6 +155,28 @@ if __name__ == "__main__":
     assert(len(mailbox.get_messages_from_performative(MessagePerformative.PROPOSE)) == 1)
     assert(len(mailbox.get_messages_from_performative(MessagePerformative.ARGUE)) == 1)
     print("*     get_messages_from_performative() => OK")
+    assert(len(mailbox.get_messages_from_performative_and_exp(MessagePerformative.ACCEPT, "Agent1")) == 1)
+    assert(len(mailbox.get_messages_from_performative_and_exp(MessagePerformative.ARGUE, "Agent1")) == 0)
+    print("*     get_messages_from_performative_and_exp() => OK")
+
+    bounded_mailbox = Mailbox(history_size=2)
+    for message in [m1, m2, m3]:
+        bounded_mailbox.receive_messages(message)
+    bounded_mailbox.get_new_messages()
+    assert(len(bounded_mailbox.get_messages()) == 2)
+    assert(len(list(bounded_mailbox.get_messages(full_history=True))) == 3)
+    assert(len(bounded_mailbox.get_messages_from_exp("Agent1")) == 1)
+    assert(len(list(bounded_mailbox.get_messages_from_exp("Agent1", full_history=True))) == 2)
+    bounded_mailbox.close()
+    unspilled_archive = MessageArchive()
+    assert(unspilled_archive.path is None and list(unspilled_archive) == [])
+    history = ArchivedHistory(2)
+    for message in [m1, m2, m3]:
+        history.append(message)
+    assert(len(history) == 3 and history.get_recent_entries() == [m2, m3])
+    assert([str(message) for message in history] == [str(message) for message in [m1, m2, m3]])
+    history.close()
+    print("*     bounded history & archive => OK")
 
     print("* 2) Testing CommunicatingAgent & MessageService")
 
@@ -80,6 +192,13 @@ if __name__ == "__main__":
     assert(agent1.get_name() == "Agent1")
     print("*     get_name() => OK")
 
+    assert(communicating_model.message_service.find_agent_from_name("Agent1") is agent1)
+    communicating_model.message_service.remove_route(agent1)
+    assert(communicating_model.message_service.find_agent_from_name("Agent1") is None)
+    communicating_model.message_service.add_route(agent1)
+    assert(communicating_model.message_service.find_agent_from_name("Agent1") is agent1)
+    print("*     find_agent_from_name() routing => OK")
+
     agent0.send_message(Message("Agent0", "Agent1", MessagePerformative.COMMIT, "Bonjour"))
     agent1.send_message(Message("Agent1", "Agent0", MessagePerformative.COMMIT, "Bonjour"))
     agent0.send_message(Message("Agent0", "Agent1", MessagePerformative.COMMIT, "Comment ça va ?"))
@@ -90,7 +209,15 @@ if __name__ == "__main__":
     assert(len(agent1.get_messages()) == 2)
     print("*     send_message() & dispatch_message (instant delivery) => OK")
 
-    MessageService.get_instance().set_instant_delivery(False)
+    other_model = TestModel()
+    other_agent0, other_agent1 = other_model.schedule.agents
+    assert(other_model.message_service is not communicating_model.message_service)
+    other_agent0.send_message(Message("Agent0", "Agent1", MessagePerformative.COMMIT, "Bonjour"))
+    assert(len(other_agent1.get_messages()) == 1)
+    assert(len(agent1.get_messages()) == 2)
+    print("*     independent models in the same process => OK")
+
+    communicating_model.message_service.set_instant_delivery(False)
 
     agent0.send_message(Message("Agent0", "Agent1", MessagePerformative.COMMIT, "Bonjour"))
     agent1.send_message(Message("Agent1", "Agent0", MessagePerformative.COMMIT, "Bonjour"))
@@ -107,3 +234,118 @@ if __name__ == "__main__":
     assert(len(agent1.get_messages()) == 4)
     print("*     send_message() & dispatch_messages => OK")
 
+    async_models = [TestAsyncModel(start) for start in range(20)]
+
+    async def run_async_models():
+        await asyncio.gather(*(async_model.run() for async_model in async_models))
+
+    asyncio.run(run_async_models())
+
+    for start, async_model in enumerate(async_models):
+        async_agent0, async_agent1 = async_model.schedule.agents
+        assert(sorted(message.get_content() for message in async_agent1.get_messages()) == list(range(start % 2, start + 1, 2)))
+        assert(len(async_agent0.get_messages()) == start // 2 + start % 2)
+    print("*     asynchronous agents (concurrent dialogues) => OK")
+
+    process_inboxes = ProcessMessageService.create_inboxes(len(ROUTES))
+    process_results = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=run_test_worker, args=(worker_id, process_inboxes, process_results))
+               for worker_id in range(len(ROUTES))]
+    for worker in workers:
+        worker.start()
+    assert([process_results.get() for _ in workers] == [(10, 10)] * len(ROUTES))
+    for worker in workers:
+        worker.join()
+    print("*     agents partitioned across processes => OK")
+
+    print("* 3) Testing MessageCodec")
+
+    coded_messages = [
+        Message("Agent0", "Agent1", MessagePerformative.PROPOSE, "Electric Engine 1"),
+        Message("Agent1", "Agent0", MessagePerformative.ARGUE, ArgumentPayload(
+            False, "Electric Engine 1", CoupleValue(CriterionName.NOISE, Value.BAD),
+            Comparison(CriterionName.NOISE, CriterionName.DURABILITY),
+        )),
+        Message("Agent0", "Agent1", MessagePerformative.ARGUE, ArgumentPayload(
+            True, "Diesel Engine, and 2", CoupleValue(CriterionName.CONSUMPTION, Value.VERY_GOOD),
+        )),
+        Message("Agent1", "Agent0", MessagePerformative.INFORM_REF, -3),
+        Message("Agent0", "Agent1", MessagePerformative.STAND_BY, None),
+    ]
+    codec = MessageCodec()
+    encoded_messages = codec.encode(coded_messages)
+    assert(len(encoded_messages) == len(coded_messages) * MessageCodec.RECORD.size)
+    assert([str(message) for message in codec.decode(encoded_messages)] == [str(message) for message in coded_messages])
+    codec_file = io.BytesIO()
+    codec.dump(coded_messages, codec_file)
+    codec_file.seek(0)
+    assert([str(message) for message in MessageCodec.load(codec_file)] == [str(message) for message in coded_messages])
+    print("*     encode() & decode(), dump() & load() => OK")
+    many_criteria = Criterion.create("ManyCriteria", ["CRITERION_{}".format(column) for column in range(300)])
+    wide_messages = [
+        Message("Agent0", "Agent1", MessagePerformative.ARGUE, ArgumentPayload(
+            True, "Electric Engine 1", CoupleValue(many_criteria.CRITERION_299, Value.GOOD),
+            Comparison(many_criteria.CRITERION_256, many_criteria.CRITERION_3),
+        )),
+        Message("Agent1", "Agent0", MessagePerformative.INFORM_REF, 2 ** 31),
+        Message("Agent1", "Agent0", MessagePerformative.INFORM_REF, -2 ** 40),
+        Message("Agent1", "Agent0", MessagePerformative.INFORM_REF, 2 ** 31 - 1),
+    ]
+    wide_codec = MessageCodec(criteria=many_criteria)
+    wide_decoded = wide_codec.decode(wide_codec.encode(wide_messages))
+    assert([str(message) for message in wide_decoded] == [str(message) for message in wide_messages])
+    assert([message.get_content() for message in wide_decoded[1:]] == [2 ** 31, -2 ** 40, 2 ** 31 - 1])
+    try:
+        wide_codec.encode([Message("Agent0", "Agent1", MessagePerformative.ARGUE, ArgumentPayload(
+            True, "Electric Engine 1", CoupleValue(HugeCriterion.FAR, Value.GOOD)))])
+        assert(False)
+    except ValueError:
+        pass
+    print("*     300 criteria & integers beyond int32 => OK")
+
+
+    print("* 4) Testing DialogueLogger")
+
+    log_file = io.StringIO()
+    logger = DialogueLogger(log_file, buffer_size=3)
+    logger.log_message(1, coded_messages[0])
+    logger.log_status(1, "Agent0", DialogueLogger.WAITING, "Agent1")
+    assert(log_file.getvalue() == "")
+    logger.log_message(2, coded_messages[4])
+    assert(log_file.getvalue().splitlines() == [
+        "Agent0  -  PROPOSE ( Electric Engine 1 )",
+        "Agent0  -  Stand by, waiting for answers from Agent1",
+        "Agent0  -  Stand by, waiting for answers from Agent1",
+    ])
+    print("*     buffered text records => OK")
+    log_file = io.StringIO()
+    logger = DialogueLogger(log_file, level=DialogueLogger.INFO, record_format=DialogueLogger.JSON)
+    logger.log_status(1, "Agent0", DialogueLogger.AGREED, "Agent1")
+    logger.log_message(1, coded_messages[3])
+    assert(log_file.getvalue() == '{"step": 1, "sender": "Agent1", "receiver": "Agent0", '
+                                  '"performative": "INFORM_REF", "content": -3}\n')
+    logger = DialogueLogger(log_file, level=DialogueLogger.OFF)
+    for message in coded_messages:
+        logger.log_message(1, message)
+    logger.flush()
+    assert(not logger.is_enabled(DialogueLogger.INFO) and log_file.getvalue().count("\n") == 1)
+    print("*     levels & JSON records => OK")
+
+    print("* 5) Testing Profiler")
+
+    profiler = Profiler()
+    with profiler.measure("block"):
+        sum(range(1000))
+    mailbox = Mailbox()
+    profiler.instrument(mailbox, "receive_messages", key_function=lambda message: message.get_performative().name)
+    for message in coded_messages:
+        mailbox.receive_messages(message)
+    assert(len(mailbox.get_new_messages()) == len(coded_messages))
+    timings = profiler.get_timings()
+    assert(timings["ARGUE"][0] == 2 and timings["PROPOSE"][0] == 1 and timings["block"][0] == 1)
+    print("*     measure() & instrument() => OK")
+    sweep_profiler = Profiler()
+    sweep_profiler.merge(profiler)
+    sweep_profiler.merge(timings)
+    assert([row[:2] for row in sweep_profiler.get_report() if row[0] == "ARGUE"] == [("ARGUE", 4)])
+    print("*     merge() & get_report() => OK")
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Parallel sweep of argumentation dialogues.
+
+Runs repetitions dialogues for every combination of a grid of parameters (corpus sizes, step limits,
+argumentation policies) on a pool of processes, and gathers the outcome of each dialogue (agreement,
+evaluation_metric score, end reason and number of steps, number of messages) in one numpy structured array.
+Dialogues stop as soon as they are over (see ArgumentModel.run_until_done), the step limit being a maximum.
+
+With a profiler (Profiler), the dialogues are profiled in the workers and their timings added up in it.
+
+Each dialogue is seeded (ArgumentModel seed) from the sweep seed and its index in the grid, so results do not
+depend on the number of workers.
+
+Run from the repository root: python sweep.py [--profile] [repetitions] [corpus_size ...]
+"""
+import functools
+import itertools
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from communication.logger.DialogueLogger import DialogueLogger
+from communication.message.MessagePerformative import MessagePerformative
+from communication.profiler.Profiler import Profiler
+from experiences import evaluation_metric
+from pw_argumentation import ArgumentModel
+
+RESULT_DTYPE = np.dtype([
+    ('corpus_size', np.int32),
+    ('step_limit', np.int32),
+    ('policy', 'U32'),
+    ('repetition', np.int32),
+    ('seed', np.uint64),
+    ('agreed', np.bool_),
+    ('score', np.float64),
+    ('reason', 'U32'),
+    ('step_count', np.int32),
+    ('message_count', np.int32),
+    ('argue_count', np.int32),
+])
+
+
+def run_dialogue(task, profiler=None):
+    """Run the dialogue of a task (corpus_size, step_limit, policy, repetition, seed), return its result row."""
+    corpus_size, step_limit, policy, repetition, seed = task
+    logger = DialogueLogger(level=DialogueLogger.OFF)
+    model = ArgumentModel(corpus_size=corpus_size, argumentation_policy=policy, seed=seed, logger=logger,
+                          profiler=profiler)
+    reason, step_count = model.run_until_done(step_limit)
+    agreed_item = model.agent1.agreed_item
+    agreed = bool(model.agent2.agreed_item and agreed_item)
+    score = evaluation_metric(model.agent1.preferences, model.agent2.preferences, agreed_item) if agreed else 0
+    messages = list(model.agent1.get_messages()) + list(model.agent2.get_messages())
+    argue_count = sum(message.get_performative() == MessagePerformative.ARGUE for message in messages)
+    return (
+        corpus_size, step_limit, policy, repetition, seed, agreed, score, reason, step_count, len(messages), argue_count,
+    )
+
+
+def run_dialogues(tasks, profile=False):
+    """Run a chunk of tasks, return their result rows and the timings of the dialogues if profile is True."""
+    profiler = Profiler() if profile else None
+    rows = [run_dialogue(task, profiler) for task in tasks]
+    return rows, profiler.get_timings() if profile else None
+
+
+def generate_tasks(corpus_sizes, repetitions, step_limits, policies, seed):
+    """Return the tasks of the grid, each one with its own seed."""
+    grid = itertools.product(corpus_sizes, step_limits, policies, range(repetitions))
+    return [
+        (corpus_size, step_limit, policy, repetition, int(np.random.SeedSequence([seed, index]).generate_state(1)[0]))
+        for index, (corpus_size, step_limit, policy, repetition) in enumerate(grid)
+    ]
+
+
+def sweep(corpus_sizes=(10, 20, 30, 40, 50, 100), repetitions=17, step_limits=(100,), policies=('best_criterion',),
+          workers=None, seed=0, chunk_size=64, profiler=None):
+    """Run the dialogues of the grid on workers processes (all the cores by default, in process if 1),
+    adding up their timings in profiler if any.
+
+    Return the results (structured array of RESULT_DTYPE, in grid order) and the number of dialogues per second.
+    """
+    tasks = generate_tasks(corpus_sizes, repetitions, step_limits, policies, seed)
+    chunks = [tasks[start:start + chunk_size] for start in range(0, len(tasks), chunk_size)]
+    run_chunk = functools.partial(run_dialogues, profile=profiler is not None)
+    start = time.perf_counter()
+    if workers == 1:
+        chunk_results = [run_chunk(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(workers) as executor:
+            chunk_results = list(executor.map(run_chunk, chunks))
+    elapsed = time.perf_counter() - start
+    rows = [row for chunk_rows, _ in chunk_results for row in chunk_rows]
+    if profiler is not None:
+        for _, timings in chunk_results:
+            profiler.merge(timings)
+    return np.array(rows, dtype=RESULT_DTYPE), len(tasks) / elapsed
+
+
+def summarize(results):
+    """Return one summary row by (corpus_size, step_limit, policy): dialogue count, agreement rate, mean score,
+    mean number of steps, mean number of messages."""
+    keys = np.unique(results[['corpus_size', 'step_limit', 'policy']])
+    summary = []
+    for key in keys:
+        group = results[(results['corpus_size'] == key['corpus_size']) & (results['step_limit'] == key['step_limit'])
+                        & (results['policy'] == key['policy'])]
+        summary.append((
+            int(key['corpus_size']), int(key['step_limit']), str(key['policy']), len(group),
+            float(group['agreed'].mean()), float(group['score'].mean()), float(group['step_count'].mean()),
+            float(group['message_count'].mean()),
+        ))
+    return summary
+
+
+if __name__ == "__main__":
+    arguments = [arg for arg in sys.argv[1:] if arg != '--profile']
+    profiler = Profiler() if '--profile' in sys.argv[1:] else None
+    repetitions = int(arguments[0]) if arguments else 17
+    corpus_sizes = [int(arg) for arg in arguments[1:]] or [10, 20, 30, 40, 50, 100]
+    results, throughput = sweep(corpus_sizes, repetitions, profiler=profiler)
+    print("{} dialogues, {:.1f} dialogues/s".format(len(results), throughput))
+    print("{:>6} {:>6} {:>16} {:>8} {:>8} {:>8} {:>8} {:>9}".format(
+        'items', 'limit', 'policy', 'count', 'agreed', 'score', 'steps', 'messages'))
+    for corpus_size, step_limit, policy, count, agreement_rate, score, step_count, message_count in summarize(results):
+        print("{:>6} {:>6} {:>16} {:>8} {:>8.3f} {:>8.3f} {:>8.2f} {:>9.2f}".format(
+            corpus_size, step_limit, policy, count, agreement_rate, score, step_count, message_count))
+    if profiler is not None:
+        print()
+        print(profiler.format_report())